@@ -0,0 +1,120 @@
+from typing import Optional, TYPE_CHECKING
+from os.path import exists
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from map import Coord, Map
+
+LANDMARKS = 16 # Quantidade padrão de landmarks
+
+class Landmarks:
+    ''' Classe que representa o pré-processamento ALT (A*, Landmarks e desigualdade triangular) de um mapa. '''
+
+    def __init__(self, map: 'Map', landmarks: list[int], forward: np.ndarray, backward: np.ndarray):
+        self.map = map
+
+        self.landmarks = landmarks # Índices dos vértices escolhidos como landmarks
+
+        self.forward = forward # Distâncias dos landmarks até cada vértice (k x n)
+        self.backward = backward # Distâncias de cada vértice até os landmarks (k x n)
+
+    @staticmethod
+    def path(map: 'Map') -> str:
+        ''' Retorna o caminho do arquivo de landmarks salvo junto ao grafo. '''
+
+        return f'{map.filepath}.landmarks.npz'
+
+    @staticmethod
+    def build(map: 'Map', k: int = LANDMARKS) -> 'Landmarks':
+        ''' Escolhe k landmarks pela seleção do mais distante e calcula suas tabelas de distância. '''
+
+        landmarks: list[int] = []
+
+        forward: list[list[float]] = []
+        backward: list[list[float]] = []
+
+        # Menor distância de cada vértice até um landmark já escolhido
+        nearest = np.full(len(map.nodes), np.inf)
+
+        # O primeiro landmark é o vértice mais distante de um vértice qualquer
+        distances = np.array(map.dijkstra(map.nodes[0]))
+        candidate = int(np.argmax(np.where(np.isfinite(distances), distances, -1)))
+
+        for _ in range(min(k, len(map.nodes))):
+            landmarks.append(candidate)
+
+            forward.append(map.dijkstra(map.nodes[candidate]))
+            backward.append(map.dijkstra(map.nodes[candidate], reverse=True))
+
+            distances = np.array(forward[-1])
+            nearest = np.minimum(nearest, np.where(np.isfinite(distances), distances, np.inf))
+
+            # Vértices inalcançáveis (outras componentes) também são bons candidatos
+            scores = np.where(np.isfinite(nearest), nearest, np.finfo(float).max)
+            scores[landmarks] = -1
+
+            candidate = int(np.argmax(scores))
+
+        return Landmarks(map, landmarks, np.array(forward), np.array(backward))
+
+    def save(self, filepath: Optional[str] = None):
+        ''' Salva as tabelas de landmarks junto ao grafo. '''
+
+        coords = np.array([(coord.x, coord.y) for coord in self.map.nodes])
+
+        with open(filepath or Landmarks.path(self.map), 'wb') as file:
+            np.savez_compressed(
+                file,
+                coords=coords,
+                landmarks=np.array(self.landmarks),
+                forward=self.forward,
+                backward=self.backward
+            )
+
+    @staticmethod
+    def load(map: 'Map', filepath: Optional[str] = None) -> Optional['Landmarks']:
+        ''' Carrega as tabelas de landmarks salvas junto ao grafo (None se ausentes ou desatualizadas). '''
+
+        filepath = filepath or Landmarks.path(map)
+
+        if not exists(filepath):
+            return None
+
+        data = np.load(filepath)
+
+        coords = np.array([(coord.x, coord.y) for coord in map.nodes])
+
+        if data['coords'].shape != coords.shape or not np.array_equal(data['coords'], coords):
+            return None
+
+        return Landmarks(map, data['landmarks'].tolist(), data['forward'], data['backward'])
+
+    @staticmethod
+    def get(map: 'Map', k: int = LANDMARKS) -> 'Landmarks':
+        ''' Carrega as tabelas de landmarks ou as constrói (e salva) se necessário. '''
+
+        landmarks = Landmarks.load(map)
+
+        if landmarks is None or len(landmarks.landmarks) < min(k, len(map.nodes)):
+            landmarks = Landmarks.build(map, k)
+            landmarks.save()
+
+        return landmarks
+
+    def __call__(self, state: 'Coord', goal: 'Coord') -> float:
+        ''' Heurística admissível ALT entre um estado e o objetivo. '''
+
+        v = self.map.ids[state]
+        t = self.map.ids[goal]
+
+        with np.errstate(invalid='ignore'):
+            # d(v, t) >= d(L, t) - d(L, v) e d(v, t) >= d(v, L) - d(t, L)
+            bounds = np.concatenate((
+                self.forward[:, t] - self.forward[:, v],
+                self.backward[:, v] - self.backward[:, t]
+            ))
+
+        bound = np.nanmax(bounds) if not np.isnan(bounds).all() else 0.0
+
+        return max(float(bound), state.haversine(goal))
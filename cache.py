@@ -0,0 +1,120 @@
+from typing import Callable, Optional
+from collections import OrderedDict
+
+LRU = 'lru' # Remove a entrada usada há mais tempo
+CLOCK = 'clock' # Aproximação do LRU por bits de referência (sem reordenar a cada acerto)
+
+POLICIES = (LRU, CLOCK)
+
+class HeuristicCache:
+    ''' Classe que memoriza uma heurística qualquer com capacidade limitada (LRU ou clock). '''
+
+    def __init__(self, h: Callable, size: int = 1 << 16, policy: str = LRU):
+        if policy not in POLICIES:
+            raise ValueError('Política de remoção inválida.')
+
+        if size <= 0:
+            raise ValueError('Capacidade inválida.')
+
+        self.h = h # Heurística memorizada
+        self.size = size # Capacidade máxima de entradas
+        self.policy = policy
+
+        self.hits = 0 # Consultas respondidas pela memória
+        self.misses = 0 # Consultas que chamaram a heurística
+
+        # LRU: entradas na ordem de uso
+        self.entries: OrderedDict[tuple[int, int], float] = OrderedDict()
+
+        # Clock: entradas em slots circulares com bit de referência
+        self.slots: dict[tuple[int, int], int] = {}
+        self.keys: list[Optional[tuple[int, int]]] = [None] * size if policy == CLOCK else []
+        self.values: list[float] = [0] * size if policy == CLOCK else []
+        self.referenced: list[bool] = [False] * size if policy == CLOCK else []
+        self.hand = 0 # Ponteiro do relógio
+
+    def __call__(self, state, goal):
+        ''' Retorna h(state, goal), calculando apenas se ausente da memória. '''
+
+        # Chave barata pelos hashes (O hash do estado é a chave de Zobrist no n-puzzle), sem reter os estados
+        key = (hash(state), hash(goal))
+
+        if self.policy == LRU:
+            value = self.entries.get(key)
+
+            if value is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+
+                return value
+
+            self.misses += 1
+
+            value = self.h(state, goal)
+
+            self.entries[key] = value
+
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+            return value
+
+        slot = self.slots.get(key)
+
+        if slot is not None:
+            self.hits += 1
+            self.referenced[slot] = True
+
+            return self.values[slot]
+
+        self.misses += 1
+
+        value = self.h(state, goal)
+
+        # Avança o ponteiro até um slot sem referência recente (dando uma segunda chance aos demais)
+        while self.referenced[self.hand]:
+            self.referenced[self.hand] = False
+            self.hand = (self.hand + 1) % self.size
+
+        old = self.keys[self.hand]
+
+        if old is not None:
+            del self.slots[old]
+
+        self.keys[self.hand] = key
+        self.values[self.hand] = value
+        self.referenced[self.hand] = True
+        self.slots[key] = self.hand
+
+        self.hand = (self.hand + 1) % self.size
+
+        return value
+
+    def __len__(self):
+        return len(self.entries) if self.policy == LRU else len(self.slots)
+
+    def __repr__(self):
+        return f'HeuristicCache({self.policy}, size={len(self)}/{self.size}, hits={self.hits}, misses={self.misses})'
+
+    def hit_rate(self) -> float:
+        ''' Retorna a fração de consultas respondidas pela memória. '''
+
+        total = self.hits + self.misses
+
+        return self.hits / total if total else 0
+
+    def clear(self):
+        ''' Esvazia a memória e zera os contadores. '''
+
+        self.entries.clear()
+        self.slots.clear()
+
+        if self.policy == CLOCK:
+            self.keys = [None] * self.size
+            self.values = [0] * self.size
+            self.referenced = [False] * self.size
+
+        self.hand = 0
+
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,158 @@
+from typing import Optional
+from json import loads, dumps
+from os import fsync
+from os.path import exists
+from struct import pack, unpack_from, calcsize
+from threading import Thread
+from queue import Queue
+from time import time
+
+HEADER = 0 # Descrição da busca (JSON)
+STATE = 1 # Estado gerado (índice do pai, peças)
+PUSH = 2 # Estado inserido na fila de prioridade (índice do pai, g, h, peças)
+POP = 3 # Estado retirado da fila de prioridade
+DEPTH = 4 # Limite de uma iteração esgotada
+LEVEL = 5 # Nível completo de uma busca em largura vetorizada (ranks)
+COMMIT = 6 # Ponto consistente com os contadores da busca (JSON)
+
+FRAME = '<BI' # Tipo e tamanho de cada registro
+FRAME_SIZE = calcsize(FRAME)
+
+INTERVAL = 60.0 # Segundos entre os pontos de restauração
+
+CHECK_CALLS = 1024 # Chamadas de due entre as leituras do relógio
+
+def encode(matrix: list[list[int]]) -> bytes:
+    ''' Codifica as peças de um estado do n-puzzle (um byte por peça). '''
+
+    return bytes(item for row in matrix for item in row)
+
+def decode(data: bytes, cols: int) -> list[list[int]]:
+    ''' Decodifica as peças de um estado do n-puzzle. '''
+
+    return [list(data[i:i + cols]) for i in range(0, len(data), cols)]
+
+class Checkpoint:
+    ''' Classe que grava incrementalmente (em segundo plano) o progresso de uma busca para retomá-la depois. '''
+
+    def __init__(self, filepath: str, interval: float = INTERVAL):
+        self.filepath = filepath
+        self.interval = interval # Segundos entre os pontos de restauração
+
+        self.buffer: list[bytes] = [] # Registros ainda não entregues ao gravador
+        self.last = time() # Instante do último ponto de restauração
+        self.calls = 0
+
+        self.writes: Queue[Optional[bytes]] = Queue() # Blocos pendentes do gravador (None encerra)
+        self.writer: Optional[Thread] = None
+
+    def open(self, header: dict) -> list[tuple[int, bytes]]:
+        ''' Retorna os registros até o último ponto consistente se o arquivo for da mesma busca (senão, recomeça o arquivo). '''
+
+        self.close()
+
+        records = self.load(header)
+
+        if not records:
+            with open(self.filepath, 'wb') as file:
+                file.write(self.frame(HEADER, dumps(header).encode()))
+
+        self.buffer.clear()
+        self.last = time()
+
+        self.writer = Thread(target=self.write, daemon=True)
+        self.writer.start()
+
+        return records
+
+    def load(self, header: dict) -> list[tuple[int, bytes]]:
+        ''' Lê os registros do arquivo, descartando o que veio depois do último ponto consistente. '''
+
+        if not exists(self.filepath):
+            return []
+
+        with open(self.filepath, 'rb') as file:
+            data = file.read()
+
+        records: list[tuple[int, bytes]] = []
+        committed = 0 # Quantidade de registros até o último COMMIT
+        end = 0 # Posição no arquivo do fim do último COMMIT
+
+        offset = 0
+
+        while offset + FRAME_SIZE <= len(data):
+            kind, size = unpack_from(FRAME, data, offset)
+
+            if offset + FRAME_SIZE + size > len(data):
+                break # Registro incompleto (interrupção durante a gravação)
+
+            records.append((kind, data[offset + FRAME_SIZE:offset + FRAME_SIZE + size]))
+            offset += FRAME_SIZE + size
+
+            if kind == COMMIT:
+                committed = len(records)
+                end = offset
+
+        if not records or records[0][0] != HEADER or loads(records[0][1]) != header or committed == 0:
+            return []
+
+        # Descarta o final não consistente para continuar gravando a partir do último COMMIT
+        with open(self.filepath, 'r+b') as file:
+            file.truncate(end)
+
+        return records[1:committed]
+
+    def frame(self, kind: int, payload: bytes = b'') -> bytes:
+        ''' Retorna o registro com tipo e tamanho. '''
+
+        return pack(FRAME, kind, len(payload)) + payload
+
+    def record(self, kind: int, payload: bytes = b''):
+        ''' Acrescenta um registro ao próximo ponto de restauração. '''
+
+        self.buffer.append(self.frame(kind, payload))
+
+    def due(self) -> bool:
+        ''' Verifica (de forma barata) se já é hora de um novo ponto de restauração. '''
+
+        self.calls += 1
+
+        if self.calls % CHECK_CALLS:
+            return False
+
+        return time() - self.last >= self.interval
+
+    def commit(self, counters: dict):
+        ''' Fecha um ponto de restauração e entrega os registros ao gravador (sem bloquear a busca). '''
+
+        self.record(COMMIT, dumps(counters).encode())
+
+        self.writes.put(b''.join(self.buffer))
+
+        self.buffer.clear()
+        self.last = time()
+
+    def write(self):
+        ''' Laço do gravador: acrescenta os blocos ao arquivo (em segundo plano). '''
+
+        with open(self.filepath, 'ab') as file:
+            while True:
+                chunk = self.writes.get()
+
+                if chunk is None:
+                    break
+
+                file.write(chunk)
+                file.flush()
+                fsync(file.fileno())
+
+    def close(self):
+        ''' Aguarda a gravação dos blocos pendentes (Os registros após o último COMMIT são descartados). '''
+
+        if self.writer is None:
+            return
+
+        self.writes.put(None)
+        self.writer.join()
+
+        self.writer = None
@@ -0,0 +1,445 @@
+from typing import Optional
+from collections import deque
+from heapq import heappush, heappop
+from time import time
+
+from search import Search
+from state import NPuzzleState
+
+WINDOW = 16 # Tamanho da janela de reotimização local
+WINDOW_EXPANSIONS = 2000 # Limite de nós expandidos pelo A* de cada janela
+
+INVERSE = {'U': 'D', 'D': 'U', 'L': 'R', 'R': 'L'} # Movimento inverso de cada movimento do espaço vazio
+
+class Board:
+    ''' Classe que representa um tabuleiro mutável (lista plana) para a construção da solução. '''
+
+    def __init__(self, matrix: list[list[int]]):
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+
+        self.tiles = [item for row in matrix for item in row] # Peça em cada célula
+        self.where = [0] * len(self.tiles) # Célula de cada peça
+
+        for cell, tile in enumerate(self.tiles):
+            self.where[tile] = cell
+
+        self.moves: list[str] = [] # Movimentos do espaço vazio realizados
+
+    def neighbors(self, cell: int):
+        ''' Retorna as células vizinhas de uma célula. '''
+
+        i, j = divmod(cell, self.cols)
+
+        if i > 0: yield cell - self.cols
+        if i < self.rows - 1: yield cell + self.cols
+        if j > 0: yield cell - 1
+        if j < self.cols - 1: yield cell + 1
+
+    def step(self, cell: int):
+        ''' Move o espaço vazio para uma célula vizinha. '''
+
+        blank = self.where[0]
+        tile = self.tiles[cell]
+
+        if cell == blank - self.cols:
+            self.moves.append('U')
+        elif cell == blank + self.cols:
+            self.moves.append('D')
+        elif cell == blank - 1:
+            self.moves.append('L')
+        else:
+            self.moves.append('R')
+
+        self.tiles[blank], self.tiles[cell] = tile, 0
+        self.where[tile], self.where[0] = blank, cell
+
+    def route(self, start: int, goals: set[int], blocked: set[int]) -> Optional[list[int]]:
+        ''' Retorna o menor caminho de células (sem a inicial) até alguma das células objetivo. '''
+
+        parents = {start: start}
+        queue = deque([start])
+
+        while queue:
+            cell = queue.popleft()
+
+            if cell in goals:
+                path = []
+
+                while cell != start:
+                    path.append(cell)
+                    cell = parents[cell]
+
+                path.reverse()
+
+                return path
+
+            for neighbor in self.neighbors(cell):
+                if neighbor in parents or neighbor in blocked:
+                    continue
+
+                parents[neighbor] = cell
+                queue.append(neighbor)
+
+        return None
+
+    def move_blank(self, targets: set[int], blocked: set[int]):
+        ''' Move o espaço vazio até alguma das células sem passar pelas bloqueadas. '''
+
+        path = self.route(self.where[0], targets, blocked)
+
+        if path is None:
+            raise RuntimeError('Espaço vazio sem caminho livre.')
+
+        for cell in path:
+            self.step(cell)
+
+    def move_tile(self, tile: int, target: int, locked: set[int], stop: Optional[set[int]] = None):
+        ''' Move uma peça até a célula alvo (ou até entrar em stop) sem mexer nas células travadas. '''
+
+        while self.where[tile] != target:
+            if stop is not None and self.where[tile] in stop:
+                return
+
+            path = self.route(self.where[tile], {target}, locked)
+
+            if path is None:
+                raise RuntimeError('Peça sem caminho livre.')
+
+            # Leva o espaço vazio à frente da peça e troca os dois de lugar
+            self.move_blank({path[0]}, locked | {self.where[tile]})
+            self.step(self.where[tile])
+
+    def solve_window(self, cells: list[int], targets: dict[int, int]):
+        ''' Resolve por BFS uma janela pequena (o espaço vazio deve estar nela). '''
+
+        inside = set(cells)
+        index = {cell: k for k, cell in enumerate(cells)}
+
+        start = tuple(self.tiles[cell] for cell in cells)
+
+        def solved(key: tuple[int, ...]):
+            return all(key[index[cell]] == tile for cell, tile in targets.items())
+
+        parents: dict[tuple[int, ...], Optional[tuple[tuple[int, ...], int]]] = {start: None}
+        queue = deque([start])
+
+        while queue:
+            key = queue.popleft()
+
+            if solved(key):
+                path = []
+
+                while parents[key] is not None:
+                    key, cell = parents[key]
+                    path.append(cell)
+
+                for cell in reversed(path):
+                    self.step(cell)
+
+                return
+
+            blank = cells[key.index(0)]
+
+            for neighbor in self.neighbors(blank):
+                if neighbor not in inside:
+                    continue
+
+                child = list(key)
+                child[index[blank]], child[index[neighbor]] = child[index[neighbor]], 0
+                child = tuple(child)
+
+                if child in parents:
+                    continue
+
+                parents[child] = (key, neighbor)
+                queue.append(child)
+
+        raise RuntimeError('Janela sem solução.')
+
+def solvable(start: NPuzzleState, goal: NPuzzleState) -> bool:
+    ''' Verifica se o objetivo é alcançável (paridade da permutação = paridade do deslocamento do vazio). '''
+
+    tiles = [item for row in start.matrix for item in row]
+    goals = {item: cell for cell, item in enumerate(item for row in goal.matrix for item in row)}
+
+    if sorted(tiles) != sorted(goals):
+        return False
+
+    # Numa única linha (ou coluna) as peças não trocam de ordem: apenas o vazio se desloca
+    if start.rows == 1 or start.cols == 1:
+        goal_tiles = [item for row in goal.matrix for item in row]
+
+        return [tile for tile in tiles if tile != 0] == [tile for tile in goal_tiles if tile != 0]
+
+    permutation = [goals[tile] for tile in tiles]
+
+    # Paridade da permutação pela quantidade de ciclos
+    visited = [False] * len(permutation)
+    parity = 0
+
+    for cell in range(len(permutation)):
+        length = 0
+
+        while not visited[cell]:
+            visited[cell] = True
+            cell = permutation[cell]
+            length += 1
+
+        if length:
+            parity += length - 1
+
+    distance = abs(start.i - goal.i) + abs(start.j - goal.j)
+
+    return parity % 2 == distance % 2
+
+def cancel(moves: list[str]) -> list[str]:
+    ''' Remove os pares de movimentos consecutivos que se desfazem. '''
+
+    result: list[str] = []
+
+    for move in moves:
+        if result and result[-1] == INVERSE[move]:
+            result.pop()
+        else:
+            result.append(move)
+
+    return result
+
+class ConstructiveSearch(Search):
+    ''' Algoritmo construtivo (subótimo) que posiciona linhas e colunas uma a uma '''
+
+    def __init__(self, optimize: bool = True, window: int = WINDOW, budget: Optional[float] = None):
+        super().__init__()
+
+        self.optimize = optimize # Se o caminho é pós-processado
+        self.window = window # Tamanho da janela de reotimização
+        self.budget = budget # Tempo máximo (segundos) do pós-processamento
+
+        self.gap = 0.0 # Razão entre o tamanho da solução e o limite inferior
+
+    def clear(self):
+        super().clear()
+
+        self.gap = 0.0
+
+    def construct(self, board: Board, goal: NPuzzleState):
+        ''' Posiciona as linhas e colunas e resolve o bloco 2x2 final. '''
+
+        rows, cols = board.rows, board.cols
+
+        def cell(i: int, j: int):
+            return i * cols + j
+
+        locked: set[int] = set()
+
+        top, left = 0, 0
+
+        # Numa única linha (ou coluna) basta deslocar o vazio, o que a janela final já resolve
+        while rows > 1 and cols > 1 and (rows - top > 2 or cols - left > 2):
+            if rows - top > 2 and (rows - top >= cols - left or cols - left <= 2):
+                # Linha superior restante
+                for j in range(left, cols - 2):
+                    board.move_tile(goal.matrix[top][j], cell(top, j), locked)
+                    locked.add(cell(top, j))
+
+                a, b = goal.matrix[top][cols - 2], goal.matrix[top][cols - 1]
+
+                if board.where[a] != cell(top, cols - 2) or board.where[b] != cell(top, cols - 1):
+                    window = [cell(i, j) for i in range(top, top + 3) for j in range(cols - 2, cols)]
+
+                    board.move_tile(a, cell(top, cols - 1), locked)
+                    board.move_tile(b, cell(top + 2, cols - 1), locked | {board.where[a]}, set(window))
+                    board.move_blank(set(window), locked | {board.where[a], board.where[b]})
+
+                    board.solve_window(window, {cell(top, cols - 2): a, cell(top, cols - 1): b})
+
+                locked.update((cell(top, cols - 2), cell(top, cols - 1)))
+                top += 1
+            else:
+                # Coluna esquerda restante
+                for i in range(top, rows - 2):
+                    board.move_tile(goal.matrix[i][left], cell(i, left), locked)
+                    locked.add(cell(i, left))
+
+                a, b = goal.matrix[rows - 2][left], goal.matrix[rows - 1][left]
+
+                if board.where[a] != cell(rows - 2, left) or board.where[b] != cell(rows - 1, left):
+                    window = [cell(i, j) for i in range(rows - 2, rows) for j in range(left, left + 3)]
+
+                    board.move_tile(a, cell(rows - 1, left), locked)
+                    board.move_tile(b, cell(rows - 1, left + 2), locked | {board.where[a]}, set(window))
+                    board.move_blank(set(window), locked | {board.where[a], board.where[b]})
+
+                    board.solve_window(window, {cell(rows - 2, left): a, cell(rows - 1, left): b})
+
+                locked.update((cell(rows - 2, left), cell(rows - 1, left)))
+                left += 1
+
+        window = [cell(i, j) for i in range(top, rows) for j in range(left, cols)]
+
+        board.solve_window(window, {c: goal.matrix[c // cols][c % cols] for c in window})
+
+    def shorten(self, start: NPuzzleState, moves: list[str]) -> list[str]:
+        ''' Reotimiza janelas do caminho com um A* local limitado. '''
+
+        rows, cols = start.rows, start.cols
+        deltas = {'U': -cols, 'D': cols, 'L': -1, 'R': 1}
+
+        def apply(tiles: list[int], blank: int, move: str):
+            cell = blank + deltas[move]
+            tiles[blank], tiles[cell] = tiles[cell], 0
+
+            return cell
+
+        tiles = [item for row in start.matrix for item in row]
+        blank = tiles.index(0)
+
+        timer = time()
+
+        result: list[str] = []
+        i = 0
+
+        while i < len(moves):
+            # O pós-processamento é opcional: ao atingir um limite, mantém o restante do caminho
+            if (self.budget is not None and time() - timer > self.budget) or self.should_stop(interval=1):
+                result.extend(moves[i:])
+                break
+
+            segment = moves[i:i + self.window]
+
+            target = tiles[:]
+            target_blank = blank
+
+            for move in segment:
+                target_blank = apply(target, target_blank, move)
+
+            replacement = self.local_search(tiles, blank, target, len(segment), rows, cols)
+
+            if replacement is not None and len(replacement) < len(segment):
+                segment = replacement
+
+            for move in segment:
+                blank = apply(tiles, blank, move)
+
+            result.extend(segment)
+            i += self.window
+
+        return cancel(result)
+
+    def local_search(
+        self,
+        tiles: list[int],
+        blank: int,
+        target: list[int],
+        limit: int,
+        rows: int,
+        cols: int
+    ) -> Optional[list[str]]:
+        ''' A* entre dois estados próximos (None se não encontrar caminho menor que limit). '''
+
+        where = [0] * len(target)
+
+        for cell, tile in enumerate(target):
+            where[tile] = cell
+
+        # Manhattan restrita às peças fora do lugar
+        h = 0
+
+        for cell, tile in enumerate(tiles):
+            if tile != 0 and where[tile] != cell:
+                h += abs(cell // cols - where[tile] // cols) + abs(cell % cols - where[tile] % cols)
+
+        start = tuple(tiles)
+        goal = tuple(target)
+
+        heap: list[tuple[int, int, int, tuple[int, ...], int, str]] = [(h, 0, 0, start, blank, '')]
+        g_score = {start: 0}
+
+        counter = 0
+        expansions = 0
+
+        while heap and expansions < WINDOW_EXPANSIONS:
+            f, g, _, key, blank, path = heappop(heap)
+
+            if key == goal:
+                return list(path)
+
+            if g > g_score[key] or f >= limit:
+                continue
+
+            expansions += 1
+            h = f - g
+
+            i, j = divmod(blank, cols)
+
+            for move, cell, valid in (
+                ('U', blank - cols, i > 0),
+                ('D', blank + cols, i < rows - 1),
+                ('L', blank - 1, j > 0),
+                ('R', blank + 1, j < cols - 1)
+            ):
+                if not valid or (path and path[-1] == INVERSE[move]):
+                    continue
+
+                tile = key[cell]
+                goal_cell = where[tile]
+
+                # Variação da distância da peça movida (de cell para blank)
+                before = abs(cell // cols - goal_cell // cols) + abs(cell % cols - goal_cell % cols)
+                after = abs(i - goal_cell // cols) + abs(j - goal_cell % cols)
+
+                child = list(key)
+                child[blank], child[cell] = tile, 0
+                child = tuple(child)
+
+                if g + 1 >= g_score.get(child, limit):
+                    continue
+
+                g_score[child] = g + 1
+                counter += 1
+
+                heappush(heap, (g + 1 + h - before + after, g + 1, counter, child, cell, path + move))
+
+        return None
+
+    def search(self, start, goal):
+        self.clear()
+
+        if goal.matrix[-1][-1] != 0:
+            raise ValueError('O objetivo deve ter o espaço vazio no canto inferior direito.')
+
+        # Limite inferior (Manhattan) do tamanho da solução
+        self.bound = start.manhattan_distance(goal)
+
+        if solvable(start, goal):
+            board = Board(start.matrix)
+
+            self.construct(board, goal)
+
+            moves = cancel(board.moves)
+
+            if self.optimize:
+                moves = self.shorten(start, moves)
+
+            self.current = NPuzzleState(start.matrix)
+
+            for move in moves:
+                if move == 'U':
+                    self.current = self.current.up()
+                elif move == 'D':
+                    self.current = self.current.down()
+                elif move == 'L':
+                    self.current = self.current.left()
+                else:
+                    self.current = self.current.right()
+
+            self.expanded = len(board.moves)
+            self.branches = len(board.moves)
+
+            self.update_path()
+
+            self.gap = (len(self.path) - 1) / self.bound if self.bound else 1.0
+
+        self.update_timer()
+        self.update_done()
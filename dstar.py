@@ -0,0 +1,229 @@
+from typing import Callable, Optional
+
+from search import Search, EXHAUSTED
+from structure import PriorityQueue
+from map import Map, Coord
+
+INF = float('inf')
+
+EPSILON = 1e-6 # Tolerância (em metros) para empates entre chaves (Erros de arredondamento de h + km)
+
+class DStarLiteSearch(Search):
+    ''' Algoritmo D* Lite (Replaneja a rota reprocessando apenas os vértices afetados pelas mudanças de custo) '''
+
+    def __init__(self, map: Map, h: Optional[Callable[[Coord, Coord], float]] = None):
+        super().__init__()
+
+        self.map = map
+        
+        # Heurística consistente (haversine e ALT continuam válidas enquanto os custos só aumentarem)
+        self.h = h if h is not None else Coord.haversine
+
+        self.predecessors = map.reverse() # Arestas de entrada de cada vértice
+
+        self.g_score: dict[Coord, float] = {} # Distância conhecida até o objetivo
+        self.rhs: dict[Coord, float] = {} # Distância prevista pelo melhor sucessor (lookahead)
+        self.keys: dict[Coord, tuple[float, float]] = {} # Chave atual de cada vértice na fila (Entradas antigas são ignoradas)
+
+        self.start: Optional[Coord] = None
+        self.goal: Optional[Coord] = None
+        self.last: Optional[Coord] = None # Origem no último replanejamento
+
+        self.km = 0.0 # Correção acumulada das chaves quando a origem se move
+
+    def clear(self):
+        super().clear()
+
+        self.structure: PriorityQueue[tuple[float, float, Coord]] = PriorityQueue()
+
+    def reset(self):
+        ''' Reinicia os contadores de uma nova execução sem descartar as distâncias já calculadas. '''
+
+        structure = self.structure
+
+        super().clear()
+
+        self.structure = structure
+
+    def key(self, coord: Coord) -> tuple[float, float]:
+        ''' Retorna a chave de prioridade do vértice. '''
+
+        m = min(self.g_score.get(coord, INF), self.rhs.get(coord, INF))
+
+        return (m + self.h(self.start, coord) + self.km, m)
+
+    def top(self) -> tuple[float, float]:
+        ''' Retorna a menor chave válida da fila (descartando entradas antigas). '''
+
+        elements = self.structure.elements
+
+        while elements and self.keys.get(elements[0][2]) != elements[0][:2]:
+            self.structure.get()
+
+        return elements[0][:2] if elements else (INF, INF)
+
+    def lookahead(self, coord: Coord) -> float:
+        ''' Retorna a menor distância até o objetivo passando por um sucessor. '''
+
+        if coord == self.goal:
+            return 0
+
+        return min(
+            (self.map.cost(coord, neighbor) + self.g_score.get(neighbor, INF) for neighbor in self.map.graph[coord]),
+            default=INF
+        )
+
+    def update_vertex(self, coord: Coord):
+        ''' Recoloca o vértice na fila se inconsistente (g != rhs), ou o remove se consistente. '''
+
+        if self.g_score.get(coord, INF) != self.rhs.get(coord, INF):
+            key = self.key(coord)
+
+            self.keys[coord] = key
+            self.structure.put((key[0], key[1], coord))
+
+            self.update_branches()
+        else:
+            self.keys.pop(coord, None)
+
+    def compute(self):
+        ''' Propaga as inconsistências até a rota da origem ficar correta. '''
+
+        while True:
+            top = self.top()
+            key = self.key(self.start)
+
+            # Chaves empatadas (a menos de EPSILON) ainda são desempatadas pelo segundo termo
+            is_below = top[0] < key[0] - EPSILON or (top[0] <= key[0] + EPSILON and top[1] < key[1])
+
+            if not is_below and self.rhs.get(self.start, INF) == self.g_score.get(self.start, INF):
+                break
+
+            if self.should_stop():
+                break
+
+            self.update_memory()
+
+            k1, k2, coord = self.structure.get()
+            key = self.key(coord)
+
+            if (k1, k2) < key:
+                # Chave desatualizada pela movimentação da origem
+                self.keys[coord] = key
+                self.structure.put((key[0], key[1], coord))
+
+                continue
+
+            self.update_expanded()
+
+            del self.keys[coord]
+
+            g_score = self.g_score.get(coord, INF)
+            rhs = self.rhs.get(coord, INF)
+
+            if g_score > rhs:
+                # Vértice sobreconsistente: a distância diminuiu
+                self.g_score[coord] = rhs
+
+                for predecessor in self.predecessors[coord]:
+                    if predecessor != self.goal:
+                        self.rhs[predecessor] = min(self.rhs.get(predecessor, INF), self.map.cost(predecessor, coord) + rhs)
+
+                    self.update_vertex(predecessor)
+            else:
+                # Vértice subconsistente: a distância aumentou, os predecessores que dependiam dele são recalculados
+                self.g_score[coord] = INF
+
+                for predecessor in self.predecessors[coord] + [coord]:
+                    if predecessor == coord or self.rhs.get(predecessor, INF) == self.map.cost(predecessor, coord) + g_score:
+                        if predecessor != self.goal:
+                            self.rhs[predecessor] = self.lookahead(predecessor)
+
+                    self.update_vertex(predecessor)
+
+    def extract(self):
+        ''' Reconstrói a rota seguindo o melhor sucessor de cada vértice. '''
+
+        if self.g_score.get(self.start, INF) == INF:
+            return
+
+        current = Coord(self.start.x, self.start.y, self.map)
+        visited = {self.start}
+
+        while current != self.goal:
+            best = min(
+                self.map.graph[current],
+                key=lambda neighbor: self.map.cost(current, neighbor) + self.g_score.get(neighbor, INF)
+            )
+
+            if best in visited or self.g_score.get(best, INF) == INF:
+                return
+
+            visited.add(best)
+
+            current = Coord(best.x, best.y, self.map, current)
+
+        self.current = current
+        self.update_path()
+
+    def replan(self):
+        ''' Atualiza a rota a partir das distâncias atuais. '''
+
+        self.compute()
+
+        self.bound = self.g_score.get(self.start, INF)
+
+        if self.status == EXHAUSTED:
+            self.extract()
+
+        self.update_timer()
+        self.update_done()
+
+    def search(self, start, goal):
+        self.clear()
+
+        self.start = start
+        self.goal = goal
+        self.last = start
+
+        self.km = 0.0
+
+        self.g_score.clear()
+        self.rhs.clear()
+        self.keys.clear()
+
+        self.rhs[goal] = 0
+        self.update_vertex(goal)
+
+        self.replan()
+
+    def move(self, start: Coord):
+        ''' Move a origem (ex.: o veículo avançou pela rota) sem replanejar. '''
+
+        self.start = start
+
+    def update(self, changes: list[tuple[Coord, Coord, Optional[float]]]):
+        ''' Aplica mudanças de custo (origem, destino, custo) no mapa e repara a rota atual. '''
+
+        self.reset()
+
+        # Corrige as chaves antigas pela distância que a origem percorreu
+        self.km += self.h(self.last, self.start)
+        self.last = self.start
+
+        for coord, neighbor, cost in changes:
+            old_cost = self.map.cost(coord, neighbor)
+
+            self.map.update_cost(coord, neighbor, cost)
+
+            new_cost = self.map.cost(coord, neighbor)
+
+            if coord != self.goal:
+                if old_cost > new_cost:
+                    self.rhs[coord] = min(self.rhs.get(coord, INF), new_cost + self.g_score.get(neighbor, INF))
+                elif self.rhs.get(coord, INF) == old_cost + self.g_score.get(neighbor, INF):
+                    self.rhs[coord] = self.lookahead(coord)
+
+            self.update_vertex(coord)
+
+        self.replan()
@@ -0,0 +1,363 @@
+from typing import Optional, TYPE_CHECKING
+from heapq import heappush, heappop
+from os.path import exists
+
+import numpy as np
+
+from search import Search
+from observer import EXPANDED
+
+if TYPE_CHECKING:
+    from map import Coord, Map
+
+WITNESS_SETTLED = 500 # Limite de vértices visitados por busca de testemunha
+
+class ContractionHierarchy:
+    ''' Classe que representa uma hierarquia de contração (Contraction Hierarchies) de um mapa. '''
+
+    def __init__(self, map: 'Map', rank: list[int], edges: dict[tuple[int, int], tuple[float, int]]):
+        self.map = map
+
+        self.rank = rank # Ordem de contração (importância) de cada vértice
+        self.edges = edges # Arestas originais e atalhos: (u, w) -> (custo, vértice do meio ou -1)
+
+        self.up: list[list[tuple[int, float]]] = [[] for _ in rank] # Arestas para vértices mais importantes
+        self.down: list[list[tuple[int, float]]] = [[] for _ in rank] # Arestas invertidas vindas de vértices mais importantes
+
+        for (u, w), (cost, _) in edges.items():
+            if rank[w] > rank[u]:
+                self.up[u].append((w, cost))
+            else:
+                self.down[w].append((u, cost))
+
+    @staticmethod
+    def path(map: 'Map') -> str:
+        ''' Retorna o caminho do arquivo da hierarquia salvo junto ao grafo. '''
+
+        return f'{map.filepath}.ch.npz'
+
+    @staticmethod
+    def witness(
+        out: list[dict[int, float]],
+        source: int,
+        ignore: int,
+        targets: set[int],
+        limit: float
+    ) -> dict[int, float]:
+        ''' Busca de Dijkstra limitada que ignora o vértice sendo contraído. '''
+
+        distances = {source: 0.0}
+        heap: list[tuple[float, int]] = [(0.0, source)]
+
+        remaining = len(targets)
+        settled = 0
+
+        while heap and settled < WITNESS_SETTLED and remaining > 0:
+            distance, u = heappop(heap)
+
+            if distance > distances[u]:
+                continue
+
+            if distance > limit:
+                break
+
+            settled += 1
+
+            if u in targets:
+                remaining -= 1
+
+            for w, cost in out[u].items():
+                if w == ignore:
+                    continue
+
+                tentative = distance + cost
+
+                if tentative < distances.get(w, float('inf')):
+                    distances[w] = tentative
+                    heappush(heap, (tentative, w))
+
+        return distances
+
+    @staticmethod
+    def shortcuts(out: list[dict[int, float]], inn: list[dict[int, float]], v: int) -> list[tuple[int, int, float]]:
+        ''' Retorna os atalhos necessários para contrair o vértice. '''
+
+        shortcuts: list[tuple[int, int, float]] = []
+
+        for u, cost_uv in inn[v].items():
+            targets = [(w, cost_uv + cost_vw) for w, cost_vw in out[v].items() if w != u]
+
+            if not targets:
+                continue
+
+            distances = ContractionHierarchy.witness(
+                out,
+                u,
+                v,
+                {w for w, _ in targets},
+                max(cost for _, cost in targets)
+            )
+
+            for w, cost in targets:
+                if distances.get(w, float('inf')) > cost:
+                    shortcuts.append((u, w, cost))
+
+        return shortcuts
+
+    @staticmethod
+    def build(map: 'Map') -> 'ContractionHierarchy':
+        ''' Ordena os vértices por importância e os contrai, adicionando atalhos. '''
+
+        n = len(map.nodes)
+
+        # Grafo restante (apenas vértices ainda não contraídos)
+        out: list[dict[int, float]] = [{} for _ in range(n)]
+        inn: list[dict[int, float]] = [{} for _ in range(n)]
+
+        edges: dict[tuple[int, int], tuple[float, int]] = {}
+
+        for coord in map.graph:
+            u = map.ids[coord]
+
+            for neighbor in map.graph[coord]:
+                w = map.ids[neighbor]
+                cost = map.cost(coord, neighbor)
+
+                if u == w or cost >= out[u].get(w, float('inf')):
+                    continue
+
+                out[u][w] = cost
+                inn[w][u] = cost
+                edges[(u, w)] = (cost, -1)
+
+        contracted_neighbors = [0] * n
+        levels = [0] * n # Profundidade de cada vértice na hierarquia
+
+        def priority(v: int, shortcuts: list[tuple[int, int, float]]):
+            ''' Diferença de arestas, vizinhos já contraídos e nível do vértice. '''
+
+            difference = len(shortcuts) - len(out[v]) - len(inn[v])
+
+            return 2 * difference + contracted_neighbors[v] + levels[v]
+
+        heap = [(priority(v, ContractionHierarchy.shortcuts(out, inn, v)), v) for v in range(n)]
+        heap.sort()
+
+        rank = [-1] * n
+        order = 0
+
+        while heap:
+            _, v = heappop(heap)
+
+            shortcuts = ContractionHierarchy.shortcuts(out, inn, v)
+
+            # Atualização preguiçosa da prioridade
+            current = priority(v, shortcuts)
+
+            if heap and current > heap[0][0]:
+                heappush(heap, (current, v))
+                continue
+
+            for u, w, cost in shortcuts:
+                if cost < out[u].get(w, float('inf')):
+                    out[u][w] = cost
+                    inn[w][u] = cost
+                    edges[(u, w)] = (cost, v)
+
+            for u in inn[v]:
+                del out[u][v]
+                contracted_neighbors[u] += 1
+                levels[u] = max(levels[u], levels[v] + 1)
+
+            for w in out[v]:
+                del inn[w][v]
+                contracted_neighbors[w] += 1
+                levels[w] = max(levels[w], levels[v] + 1)
+
+            out[v].clear()
+            inn[v].clear()
+
+            rank[v] = order
+            order += 1
+
+        return ContractionHierarchy(map, rank, edges)
+
+    def save(self, filepath: Optional[str] = None):
+        ''' Salva a hierarquia junto ao grafo. '''
+
+        coords = np.array([(coord.x, coord.y) for coord in self.map.nodes])
+
+        keys = list(self.edges.keys())
+
+        with open(filepath or ContractionHierarchy.path(self.map), 'wb') as file:
+            np.savez_compressed(
+                file,
+                coords=coords,
+                rank=np.array(self.rank),
+                sources=np.array([u for u, _ in keys], dtype=np.int64),
+                targets=np.array([w for _, w in keys], dtype=np.int64),
+                costs=np.array([self.edges[key][0] for key in keys]),
+                middles=np.array([self.edges[key][1] for key in keys], dtype=np.int64)
+            )
+
+    @staticmethod
+    def load(map: 'Map', filepath: Optional[str] = None) -> Optional['ContractionHierarchy']:
+        ''' Carrega a hierarquia salva junto ao grafo (None se ausente ou desatualizada). '''
+
+        filepath = filepath or ContractionHierarchy.path(map)
+
+        if not exists(filepath):
+            return None
+
+        data = np.load(filepath)
+
+        coords = np.array([(coord.x, coord.y) for coord in map.nodes])
+
+        if data['coords'].shape != coords.shape or not np.array_equal(data['coords'], coords):
+            return None
+
+        edges = {
+            (u, w): (cost, middle)
+            for u, w, cost, middle in zip(
+                data['sources'].tolist(),
+                data['targets'].tolist(),
+                data['costs'].tolist(),
+                data['middles'].tolist()
+            )
+        }
+
+        return ContractionHierarchy(map, data['rank'].tolist(), edges)
+
+    @staticmethod
+    def get(map: 'Map') -> 'ContractionHierarchy':
+        ''' Carrega a hierarquia ou a constrói (e salva) se necessário. '''
+
+        hierarchy = ContractionHierarchy.load(map)
+
+        if hierarchy is None:
+            hierarchy = ContractionHierarchy.build(map)
+            hierarchy.save()
+
+        return hierarchy
+
+    def unpack(self, u: int, w: int) -> list[int]:
+        ''' Expande um atalho nos vértices originais (sem incluir u). '''
+
+        stack = [(u, w)]
+        path: list[int] = []
+
+        while stack:
+            a, b = stack.pop()
+            middle = self.edges[(a, b)][1]
+
+            if middle == -1:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+
+        return path
+
+class ContractionHierarchySearch(Search):
+    ''' Busca bidirecional ascendente sobre uma hierarquia de contração '''
+
+    def __init__(self, hierarchy: ContractionHierarchy):
+        super().__init__()
+
+        self.hierarchy = hierarchy
+
+        self.distance = float('inf') # Custo do caminho encontrado
+
+    def clear(self):
+        super().clear()
+
+        self.distance = float('inf')
+
+    def search(self, start, goal):
+        self.clear()
+
+        hierarchy = self.hierarchy
+        map = hierarchy.map
+
+        s = map.ids[start]
+        t = map.ids[goal]
+
+        distances = ({s: 0.0}, {t: 0.0})
+        parents: tuple[dict[int, int], dict[int, int]] = ({}, {})
+        heaps: tuple[list, list] = ([(0.0, s)], [(0.0, t)])
+        graphs = (hierarchy.up, hierarchy.down)
+
+        meeting = s if s == t else -1
+        best = 0.0 if s == t else float('inf')
+
+        while heaps[0] or heaps[1]:
+            if self.should_stop():
+                break
+
+            self.bound = min(heap[0][0] if heap else float('inf') for heap in heaps)
+
+            self.memory = max(self.memory, len(heaps[0]) + len(heaps[1]))
+
+            # Não há caminho melhor quando ambas as filas superam o melhor custo
+            if min(heap[0][0] if heap else float('inf') for heap in heaps) >= best:
+                break
+
+            for side in (0, 1):
+                if not heaps[side]:
+                    continue
+
+                distance, u = heappop(heaps[side])
+
+                if distance > distances[side][u] or distance >= best:
+                    continue
+
+                self.update_expanded()
+
+                if self.observer is not None:
+                    self.observer.publish(EXPANDED, self, map.nodes[u])
+
+                other = distances[1 - side].get(u)
+
+                if other is not None and distance + other < best:
+                    best = distance + other
+                    meeting = u
+
+                for w, cost in graphs[side][u]:
+                    tentative = distance + cost
+
+                    if tentative < distances[side].get(w, float('inf')):
+                        self.update_branches()
+
+                        distances[side][w] = tentative
+                        parents[side][w] = u
+
+                        heappush(heaps[side], (tentative, w))
+
+        if meeting != -1:
+            self.distance = best
+
+            forward = [meeting]
+            while forward[-1] != s:
+                forward.append(parents[0][forward[-1]])
+            forward.reverse()
+
+            backward = [meeting]
+            while backward[-1] != t:
+                backward.append(parents[1][backward[-1]])
+
+            ids = [s]
+            for u, w in zip(forward, forward[1:]):
+                ids.extend(hierarchy.unpack(u, w))
+            for w, u in zip(backward, backward[1:]):
+                ids.extend(hierarchy.unpack(w, u))
+
+            # Reconstrói os estados encadeados como nos demais algoritmos
+            self.current = None
+            for i in ids:
+                coord = map.nodes[i]
+                self.current = type(coord)(coord.x, coord.y, map, self.current)
+
+            self.update_path()
+
+        self.update_timer()
+        self.update_done()
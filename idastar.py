@@ -0,0 +1,440 @@
+from typing import Callable, Optional
+from os import cpu_count
+from random import randrange
+from multiprocessing import Process, Queue, Array, Value, Lock
+from queue import Empty
+from struct import pack, unpack_from
+
+from search import Search, EXHAUSTED
+from state import NPuzzleState
+from constructive import solvable
+from pruning import MoveAutomaton, DIRECTIONS, PRUNED
+from checkpoint import DEPTH
+
+TASKS_PER_WORKER = 32 # Subárvores iniciais por trabalhador (Granularidade do balanceamento)
+MAX_SPLIT_DEPTH = 12 # Profundidade máxima da divisão da árvore
+
+CHECK_NODES = 4096 # Nós entre as verificações do sinal de parada
+
+INF = float('inf')
+
+# Subárvore: (posições do vazio desde a raiz, peças, vazio, g, h, estado do autômato de poda)
+Task = tuple[list[int], list[int], int, int, int, int]
+
+def tables(goal: NPuzzleState) -> tuple[list[list[tuple[int, int]]], list[list[int]]]:
+    ''' Retorna os movimentos (direção, posição) do vazio e a distância de Manhattan de cada peça em cada posição. '''
+
+    rows, cols = goal.rows, goal.cols
+
+    moves: list[list[tuple[int, int]]] = []
+
+    for position in range(rows * cols):
+        i, j = divmod(position, cols)
+
+        moves.append([
+            (move, (i + di) * cols + j + dj)
+            for move, (di, dj) in enumerate(DIRECTIONS)
+            if 0 <= i + di < rows and 0 <= j + dj < cols
+        ])
+
+    targets = {item: (i, j) for i, row in enumerate(goal.matrix) for j, item in enumerate(row)}
+
+    distances = [[0] * (rows * cols) for _ in range(rows * cols)]
+
+    for tile, (i2, j2) in targets.items():
+        if tile == 0:
+            continue
+
+        for position in range(rows * cols):
+            i1, j1 = divmod(position, cols)
+
+            distances[tile][position] = abs(i1 - i2) + abs(j1 - j2)
+
+    return moves, distances
+
+def split(
+    tiles: list[int], 
+    blank: int, 
+    h: int, 
+    moves: list[list[tuple[int, int]]], 
+    distances: list[list[int]], 
+    transitions: list[list[int]], 
+    size: int
+) -> tuple[list[Task], Optional[list[int]]]:
+    ''' Divide a árvore em subárvores por níveis (Retorna também a solução se ela for mais rasa que a divisão). '''
+
+    level: list[Task] = [([], tiles, blank, 0, h, 0)]
+
+    for depth in range(MAX_SPLIT_DEPTH):
+        for path, tiles, blank, g, h, node in level:
+            if h == 0:
+                return level, path
+
+        if len(level) >= size:
+            break
+
+        children: list[Task] = []
+
+        for path, tiles, blank, g, h, node in level:
+            for move, target in moves[blank]:
+                next_node = transitions[node][move]
+
+                if next_node == PRUNED:
+                    continue
+
+                tile = tiles[target]
+
+                child = tiles[:]
+                child[blank], child[target] = tile, 0
+
+                children.append((
+                    path + [target],
+                    child,
+                    target,
+                    g + 1,
+                    h + distances[tile][blank] - distances[tile][target],
+                    next_node
+                ))
+
+        level = children
+
+    for path, tiles, blank, g, h, node in level:
+        if h == 0:
+            return level, path
+
+    return level, None
+
+class Shared:
+    ''' Classe que representa o estado compartilhado entre os trabalhadores (deques de subárvores e sinal de parada). '''
+
+    def __init__(
+        self, 
+        tasks: list[Task], 
+        moves: list[list[tuple[int, int]]], 
+        distances: list[list[int]], 
+        transitions: list[list[int]], 
+        processes: int
+    ):
+        self.tasks = tasks
+        self.moves = moves
+        self.distances = distances
+        self.transitions = transitions
+
+        self.processes = processes
+
+        # Deque de cada trabalhador: índices [head, tail) das subárvores (o dono retira do fim, os ladrões do início)
+        self.heads = Array('l', processes, lock=False)
+        self.tails = Array('l', processes, lock=False)
+        self.locks = [Lock() for _ in range(processes)]
+
+        self.found = Value('b', 0, lock=False) # Alguma solução foi encontrada (ou a busca foi interrompida)
+        self.nodes = Value('q', 0) # Nós expandidos na iteração atual (Somados a cada CHECK_NODES por trabalhador)
+
+    def reset(self):
+        ''' Distribui as subárvores em blocos contíguos para uma nova iteração. '''
+
+        for index in range(self.processes):
+            self.heads[index] = index * len(self.tasks) // self.processes
+            self.tails[index] = (index + 1) * len(self.tasks) // self.processes
+
+        self.found.value = 0
+        self.nodes.value = 0
+
+    def count(self, nodes: int):
+        ''' Soma os nós expandidos por um trabalhador ao contador compartilhado. '''
+
+        with self.nodes.get_lock():
+            self.nodes.value += nodes
+
+    def take(self, index: int) -> Optional[int]:
+        ''' Retira uma subárvore do próprio deque ou, se vazio, rouba do início do deque de outro trabalhador. '''
+
+        with self.locks[index]:
+            if self.heads[index] < self.tails[index]:
+                self.tails[index] -= 1
+
+                return self.tails[index]
+
+        offset = randrange(self.processes)
+
+        for counter in range(self.processes):
+            victim = (offset + counter) % self.processes
+
+            if victim == index or self.heads[victim] >= self.tails[victim]:
+                continue
+
+            with self.locks[victim]:
+                if self.heads[victim] < self.tails[victim]:
+                    self.heads[victim] += 1
+
+                    return self.heads[victim] - 1
+
+        return None
+
+def iterate(shared: Shared, index: int, bound: int, stop: Optional[Callable[[int], bool]] = None) -> tuple[Optional[list[int]], float, int]:
+    ''' Executa uma iteração de IDA* sobre as subárvores (Retorna a solução, o próximo limite e os nós expandidos). '''
+
+    moves = shared.moves
+    distances = shared.distances
+    transitions = shared.transitions
+    found = shared.found
+
+    minimum = INF
+    nodes = 0
+
+    path: list[int] = []
+
+    tiles: list[int] = []
+
+    def depth_first(g: int, h: int, blank: int, node: int) -> bool:
+        ''' Busca em profundidade com movimentos feitos e desfeitos no próprio vetor de peças. '''
+
+        nonlocal minimum, nodes
+
+        f = g + h
+
+        if f > bound:
+            if f < minimum:
+                minimum = f
+
+            return False
+
+        if h == 0:
+            return True
+
+        nodes += 1
+
+        if nodes % CHECK_NODES == 0:
+            shared.count(CHECK_NODES)
+
+            if found.value or (stop is not None and stop(nodes)):
+                found.value = 1
+
+                return False
+
+        for move, target in moves[blank]:
+            next_node = transitions[node][move]
+
+            # Movimentos podados pelo autômato nem são gerados
+            if next_node == PRUNED:
+                continue
+
+            tile = tiles[target]
+
+            tiles[blank] = tile
+            tiles[target] = 0
+            path.append(target)
+
+            if depth_first(g + 1, h + distances[tile][blank] - distances[tile][target], target, next_node):
+                return True
+
+            path.pop()
+            tiles[target] = tile
+            tiles[blank] = 0
+
+        return False
+
+    while not found.value:
+        task = shared.take(index)
+
+        if task is None:
+            break
+
+        prefix, task_tiles, blank, g, h, node = shared.tasks[task]
+
+        tiles[:] = task_tiles
+        path.clear()
+
+        if depth_first(g, h, blank, node):
+            found.value = 1
+
+            return prefix + path, minimum, nodes
+
+        if found.value:
+            break
+
+    return None, minimum, nodes
+
+def work(shared: Shared, index: int, commands: Queue, results: Queue):
+    ''' Laço de um trabalhador: executa uma iteração para cada limite recebido (None encerra). '''
+
+    while True:
+        bound = commands.get()
+
+        if bound is None:
+            break
+
+        results.put((index, *iterate(shared, index, bound)))
+
+class ParallelIDAStarSearch(Search):
+    ''' Algoritmo IDA* paralelo (Manhattan incremental) com divisão da árvore e roubo de subárvores entre processos '''
+
+    def __init__(self, processes: Optional[int] = None, fsm: Optional[MoveAutomaton] = None):
+        super().__init__()
+
+        self.resumable = True
+
+        self.processes = processes # Número de processos trabalhadores (padrão: número de núcleos)
+        self.fsm = fsm # Autômato de poda de movimentos (padrão: MoveAutomaton.get())
+
+        self.depth = 0 # Limite (f) da iteração atual
+
+    def clear(self):
+        super().clear()
+
+        self.depth = 0
+
+    def frontier(self):
+        return 0
+
+    def build(self, start: NPuzzleState, moves: list[int]) -> list[NPuzzleState]:
+        ''' Reconstrói a solução a partir das posições sucessivas do espaço vazio. '''
+
+        current = NPuzzleState(start.matrix)
+
+        for position in moves:
+            current = current.moved(*divmod(position, current.cols))
+
+        return current.path()
+
+    def search(self, start, goal):
+        self.clear()
+
+        if not solvable(start, goal):
+            self.update_timer()
+            self.update_done()
+
+            return
+
+        processes = max(1, self.processes or cpu_count() or 1)
+
+        moves, distances = tables(goal)
+
+        tiles = [item for row in start.matrix for item in row]
+        blank = start.i * start.cols + start.j
+        h = sum(distances[tile][position] for position, tile in enumerate(tiles) if tile != 0)
+
+        transitions = (self.fsm or MoveAutomaton.get()).transitions
+
+        tasks, solution = split(tiles, blank, h, moves, distances, transitions, processes * TASKS_PER_WORKER)
+
+        self.memory = len(tasks)
+
+        if solution is None:
+            # Retoma a partir do limite da última iteração esgotada
+            for kind, payload in self.open_checkpoint(start, goal):
+                if kind == DEPTH:
+                    h = int(unpack_from('<d', payload)[0])
+
+            solution = self.run(Shared(tasks, moves, distances, transitions, processes), h)
+
+        if solution is not None:
+            self.current = self.build(start, solution)[-1]
+            self.update_path()
+
+            self.depth = len(solution)
+            self.bound = self.depth
+
+        self.update_timer()
+        self.update_done()
+
+    def update_iteration(self, bound: float):
+        ''' Grava o limite da próxima iteração no ponto de restauração '''
+
+        if self.checkpoint is None or bound == INF:
+            return
+
+        self.checkpoint.record(DEPTH, pack('<d', bound))
+        self.update_checkpoint(True)
+
+    def run(self, shared: Shared, bound: int) -> Optional[list[int]]:
+        ''' Executa as iterações até a primeira solução (ou até algum limite da busca). '''
+
+        if shared.processes == 1:
+            # Sem processos: os limites da busca são verificados dentro da própria iteração
+            stop = lambda nodes: self.should_stop(self.expanded + nodes, interval=1)
+
+            while bound != INF and not self.should_stop(interval=1):
+                self.depth = bound
+
+                shared.reset()
+
+                solution, bound, nodes = iterate(shared, 0, bound, stop)
+
+                self.update_expanded(nodes)
+
+                if solution is not None or self.status != EXHAUSTED:
+                    return solution
+
+                # Todos os limites menores foram esgotados
+                self.bound = self.depth
+
+                self.update_iteration(bound)
+
+            return None
+
+        commands = [Queue() for _ in range(shared.processes)]
+        results: Queue = Queue()
+
+        workers = [
+            Process(target=work, args=(shared, index, commands[index], results), daemon=True)
+            for index in range(shared.processes)
+        ]
+
+        for worker in workers:
+            worker.start()
+
+        try:
+            while True:
+                self.depth = bound
+
+                shared.reset()
+
+                expanded = self.expanded # Nós das iterações anteriores
+
+                for command in commands:
+                    command.put(bound)
+
+                solution = None
+                bound = INF
+
+                pending = shared.processes
+
+                # O próximo limite é o menor f excedido por todos os trabalhadores
+                while pending > 0:
+                    try:
+                        index, candidate, minimum, nodes = results.get(timeout=0.1)
+                    except Empty:
+                        # Os trabalhadores só informam os nós no fim da iteração: usa o contador compartilhado
+                        if self.should_stop(expanded + shared.nodes.value, interval=1):
+                            shared.found.value = 1
+
+                        continue
+
+                    pending -= 1
+
+                    self.update_expanded(nodes)
+
+                    if candidate is not None and solution is None:
+                        solution = candidate
+
+                    bound = min(bound, minimum)
+
+                if solution is not None or self.status != EXHAUSTED:
+                    return solution
+
+                self.bound = self.depth
+
+                if bound == INF:
+                    return None
+
+                self.update_iteration(bound)
+        finally:
+            for command in commands:
+                command.put(None)
+
+            for worker in workers:
+                worker.join(timeout=1)
+
+                if worker.is_alive():
+                    worker.terminate()
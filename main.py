@@ -1,5 +1,7 @@
 from state import *
 from search import *
+from constructive import ConstructiveSearch
+from portfolio import Portfolio
 
 from utils import draw
 
@@ -9,9 +11,12 @@ solvers: dict[str, Search] = {
     'A_STAR_H1': AStarSearch(NPuzzleState.tiles_out_of_place),
     'A_STAR_H2': AStarSearch(NPuzzleState.manhattan_distance),
     'BIDIRECTIONAL_H1': BidirectionalAStarSearch(NPuzzleState.tiles_out_of_place),
-    'BIDIRECTIONAL_H2': BidirectionalAStarSearch(NPuzzleState.manhattan_distance)
+    'BIDIRECTIONAL_H2': BidirectionalAStarSearch(NPuzzleState.manhattan_distance),
+    'CONSTRUCTIVE': ConstructiveSearch()
 }
 
+RACE = False # Executa os algoritmos em paralelo e para no primeiro resultado ótimo
+
 start = NPuzzleState.start(15, 15)
 goal = NPuzzleState.goal(15)
 
@@ -21,17 +26,35 @@ print(start)
 print('-' * 10 + f' GOAL ' + '-' * 10)
 print(goal)
 
-for name in solvers:
-    print('-' * 10 + f' {name} ' + '-' * 10)
+if RACE:
+    portfolio = Portfolio(tuple(solvers))
     
-    solver = solvers[name]
+    name, result = portfolio.race(start, goal)
     
-    solver.search(start, goal)
-
-    print('Passos:', len(solver.path) - 1)
-    print('Tempo Gasto:', solver.timer)
-    print('Memória Máxima:', solver.memory)
-    print('Nós Expandidos:', solver.expanded)
-    print('Fator de Ramificação:', solver.branches / solver.expanded if solver.expanded > 0 else 0)
-
-    draw(solver.path)
\ No newline at end of file
+    if result is not None:
+        print('-' * 10 + f' {name} ' + '-' * 10)
+        
+        print('Passos:', len(result['path']) - 1)
+        print('Tempo Gasto:', result['timer'])
+        print('Memória Máxima:', result['memory'])
+        print('Nós Expandidos:', result['expanded'])
+        print('Vitórias:', portfolio.stats['wins'])
+        
+        draw([NPuzzleState(matrix) for matrix in result['path']])
+    else:
+        print('Nenhum algoritmo terminou a tempo.')
+else:
+    for name in solvers:
+        print('-' * 10 + f' {name} ' + '-' * 10)
+        
+        solver = solvers[name]
+        
+        solver.search(start, goal)
+
+        print('Passos:', len(solver.path) - 1)
+        print('Tempo Gasto:', solver.timer)
+        print('Memória Máxima:', solver.memory)
+        print('Nós Expandidos:', solver.expanded)
+        print('Fator de Ramificação:', solver.branches / solver.expanded if solver.expanded > 0 else 0)
+
+        draw(solver.path)
\ No newline at end of file
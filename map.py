@@ -1,13 +1,18 @@
 from typing import Optional
-from random import choice
-from time import sleep
+from random import uniform
 from json import loads
+from math import radians, sin, cos, asin, sqrt
+from heapq import heappush, heappop
 
 from threading import Thread
 from tkinter import Tk, Canvas
 
 from state import State
 from search import *
+from observer import Observer, EXPANDED, PATH
+from spatial import SpatialIndex
+from alt import Landmarks
+from cache import HeuristicCache
 
 BG_COLOR = '#333333'
     
@@ -27,7 +32,9 @@ PATH_COLOR = '#00FFAA'
 FPS = 60
 INTERVAL_TIME = 0
 
-DELAY = 0.2
+MAX_EVENTS = 200 # Eventos desenhados por quadro
+
+EARTH_RADIUS = 6371008.8 # Raio médio da Terra (em metros)
 
 class Coord(State):
     def __init__(
@@ -64,16 +71,26 @@ class Coord(State):
     def distance(self, other: 'Coord') -> float:
         return ((self.x - other.x) ** 2 + (self.y - other.y) ** 2) ** 0.5
 
-    def expand(self):
-        sleep(DELAY)
+    def haversine(self, other: 'Coord') -> float:
+        ''' Retorna a distância em metros sobre a superfície da Terra (x = longitude, y = latitude). '''
+        
+        lat1, lat2 = radians(self.y), radians(other.y)
+        
+        dlat = lat2 - lat1
+        dlon = radians(other.x - self.x)
         
+        a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+        
+        return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(a)))
+
+    def expand(self):
         if self.map is None:
             return []
         
         states = []
         
         for neighbor in self.map.graph[self]:
-            cost = self.distance(neighbor)
+            cost = self.map.cost(self, neighbor)
             state = Coord(neighbor.x, neighbor.y, self.map, self)
             
             states.append((cost, state))
@@ -86,6 +103,11 @@ class Map:
         
         self.graph: dict[Coord, list[Coord]] = {}
         
+        self.nodes: list[Coord] = [] # Vértices do grafo (Na ordem de carregamento)
+        self.ids: dict[Coord, int] = {} # Índice de cada vértice em nodes
+        
+        self.weights: dict[tuple[Coord, Coord], float] = {} # Custos alterados das arestas (interdições, congestionamentos)
+        
         self.min = Coord(float('inf'), float('inf'))
         self.max = Coord(float('-inf'), float('-inf'))
         
@@ -140,8 +162,73 @@ class Map:
                     
                 if self.max.y < coord.y:
                     self.max.y = coord.y
+        
+        self.nodes = list(self.graph.keys())
+        self.ids = {coord: i for i, coord in enumerate(self.nodes)}
+
+    def cost(self, coord: Coord, neighbor: Coord) -> float:
+        ''' Retorna o custo (em metros) da aresta entre dois vértices vizinhos. '''
+        
+        if self.weights:
+            weight = self.weights.get((coord, neighbor))
+            
+            if weight is not None:
+                return weight
+        
+        return coord.haversine(neighbor)
+
+    def update_cost(self, coord: Coord, neighbor: Coord, cost: Optional[float]):
+        ''' Altera o custo da aresta (inf para interditar, None para restaurar o comprimento). '''
+        
+        if cost is None:
+            self.weights.pop((coord, neighbor), None)
+        else:
+            self.weights[(coord, neighbor)] = cost
+
+    def reverse(self) -> dict[Coord, list[Coord]]:
+        ''' Retorna o grafo com as arestas invertidas. '''
+        
+        graph: dict[Coord, list[Coord]] = {coord: [] for coord in self.graph}
+        
+        for coord in self.graph:
+            for neighbor in self.graph[coord]:
+                graph[neighbor].append(coord)
+        
+        return graph
 
-    def draw(self, solver: Search):
+    def dijkstra(self, source: Coord, reverse: bool = False) -> list[float]:
+        ''' Retorna a distância da origem até todos os vértices (ou de todos até a origem se reverse). '''
+        
+        graph = self.reverse() if reverse else self.graph
+        
+        distances = [float('inf')] * len(self.nodes)
+        distances[self.ids[source]] = 0
+        
+        heap: list[tuple[float, int]] = [(0, self.ids[source])]
+        
+        while heap:
+            distance, i = heappop(heap)
+            
+            if distance > distances[i]:
+                continue
+            
+            coord = self.nodes[i]
+            
+            for neighbor in graph[coord]:
+                j = self.ids[neighbor]
+                
+                if reverse:
+                    tentative = distance + self.cost(neighbor, coord)
+                else:
+                    tentative = distance + self.cost(coord, neighbor)
+                
+                if tentative < distances[j]:
+                    distances[j] = tentative
+                    heappush(heap, (tentative, j))
+        
+        return distances
+
+    def draw(self, solver: Search, observer: Observer, start: Coord, goal: Coord):
         ovals: dict[Coord, int] = {}
         lines: dict[tuple[Coord, Coord], int] = {}
         
@@ -156,12 +243,12 @@ class Map:
         )
         canvas.pack()
         
-        div_x = (map.max.x - map.min.x)
-        div_y = (map.max.y - map.min.y)
+        div_x = (self.max.x - self.min.x)
+        div_y = (self.max.y - self.min.y)
         
-        for coord in map.graph:
-            x = (coord.x - map.min.x) * BOX_SIZE / div_x
-            y = (coord.y - map.min.y) * BOX_SIZE / div_y
+        for coord in self.graph:
+            x = (coord.x - self.min.x) * BOX_SIZE / div_x
+            y = (coord.y - self.min.y) * BOX_SIZE / div_y
             
             ovals[coord] = canvas.create_oval(
                 x - NODE_SIZE / 2, 
@@ -172,9 +259,12 @@ class Map:
                 width=0
             )
         
-            for neighbor in map.graph[coord]:
-                nx = (neighbor.x - map.min.x) * BOX_SIZE / div_x
-                ny = (neighbor.y - map.min.y) * BOX_SIZE / div_y
+            for neighbor in self.graph[coord]:
+                if (coord, neighbor) in lines:
+                    continue
+                
+                nx = (neighbor.x - self.min.x) * BOX_SIZE / div_x
+                ny = (neighbor.y - self.min.y) * BOX_SIZE / div_y
                 
                 line = canvas.create_line(
                     x, 
@@ -187,61 +277,58 @@ class Map:
                 
                 lines[(coord, neighbor)] = line
                 lines[(neighbor, coord)] = line
+        
+        for oval in ovals.values():
+            canvas.tag_raise(oval)
+        
+        # Vértices já coloridos por cor (Apenas as mudanças são desenhadas a cada quadro)
+        colored: dict[str, set[Coord]] = {NODE_START_COLOR: set(), NODE_GOAL_COLOR: set(), PATH_COLOR: set()}
+        
+        def paint(item: Coord, color: str):
+            ''' Colore um vértice e as arestas até os vizinhos de mesma cor. '''
             
-            for oval in ovals.values():
-                canvas.tag_raise(oval)
+            colored[color].add(item)
+            
+            canvas.itemconfig(ovals[item], fill=color)
+            canvas.tag_raise(ovals[item])
+            
+            for neighbor in self.graph[item]:
+                if neighbor not in colored[color]:
+                    continue
+                
+                canvas.itemconfig(lines[(item, neighbor)], fill=color)
+                canvas.tag_raise(lines[(item, neighbor)])
+                canvas.tag_raise(ovals[item])
+                canvas.tag_raise(ovals[neighbor])
+        
+        paint(start, NODE_START_COLOR)
+        paint(goal, NODE_GOAL_COLOR)
         
-        canvas.itemconfig(ovals[start], fill=NODE_START_COLOR)
-        canvas.tag_raise(ovals[start])
+        def close():
+            ''' Cancela a busca ao fechar a janela. '''
+            
+            if solver.token is not None:
+                solver.token.cancel()
+            
+            root.destroy()
         
-        canvas.itemconfig(ovals[goal], fill=NODE_GOAL_COLOR)
-        canvas.tag_raise(ovals[goal])
+        root.protocol('WM_DELETE_WINDOW', close)
     
         def run():
-            if solver.is_done:
-                for item in solver.path:
-                    canvas.itemconfig(ovals[item], fill=PATH_COLOR)
-                    canvas.tag_raise(ovals[item])
+            for event in observer.drain(MAX_EVENTS):
+                if event.kind == PATH:
+                    for item in event.state:
+                        paint(item, PATH_COLOR)
                     
-                    for neighbor in map.graph[item]:
-                        if neighbor not in solver.path:
-                            continue
-                        
-                        canvas.itemconfig(lines[(item, neighbor)], fill=PATH_COLOR)
-                        canvas.tag_raise(lines[(item, neighbor)])
+                    return # canvas.after(INTERVAL_TIME, root.destroy)
                 
-                return # canvas.after(INTERVAL_TIME, root.destroy)
-
-            if isinstance(solver, BidirectionalAStarSearch):
-                forward_closed_set = list(solver.forward.g_score.keys())
-            elif isinstance(solver, IterativeDeepeningSearch | AStarSearch):
-                forward_closed_set = solver.current.path()
-            else:
-                forward_closed_set = solver.closed_set.copy()
-            
-            for item in forward_closed_set:
-                canvas.itemconfig(ovals[item], fill=NODE_START_COLOR)
-                canvas.tag_raise(ovals[item])
+                if event.kind != EXPANDED:
+                    continue
                 
-                for neighbor in map.graph[item]:
-                    if neighbor not in forward_closed_set:
-                        continue
-                    
-                    canvas.itemconfig(lines[(item, neighbor)], fill=NODE_START_COLOR)
-                    canvas.tag_raise(lines[(item, neighbor)])
-            
-            if isinstance(solver, BidirectionalAStarSearch):
-                backward_closed_set = list(solver.backward.g_score.keys())
-                for item in backward_closed_set:
-                    canvas.itemconfig(ovals[item], fill=NODE_GOAL_COLOR)
-                    canvas.tag_raise(ovals[item])
-                    
-                    for neighbor in map.graph[item]:
-                        if neighbor not in backward_closed_set:
-                            continue
-                        
-                        canvas.itemconfig(lines[(item, neighbor)], fill=NODE_GOAL_COLOR)
-                        canvas.tag_raise(lines[(item, neighbor)])
+                if isinstance(solver, BidirectionalAStarSearch) and event.source is solver.backward:
+                    paint(event.state, NODE_GOAL_COLOR)
+                else:
+                    paint(event.state, NODE_START_COLOR)
                 
             canvas.after(1000 // FPS, run)
             
@@ -251,17 +338,25 @@ class Map:
 if __name__ == '__main__':
     map = Map('map.geojson')
     
-    solver = BidirectionalAStarSearch(Coord.distance)
+    # Heurística ALT (Landmarks pré-computados e salvos junto ao grafo), memorizada por vértice
+    solver = BidirectionalAStarSearch(HeuristicCache(Landmarks.get(map)))
+    
+    index = SpatialIndex(map)
+    
+    # Pontos arbitrários (longitude, latitude) ajustados aos vértices mais próximos
+    points = [
+        (uniform(map.min.x, map.max.x), uniform(map.min.y, map.max.y)),
+        (uniform(map.min.x, map.max.x), uniform(map.min.y, map.max.y))
+    ]
     
-    nodes = list(map.graph.keys())
+    start, goal = index.snap(points)
     
-    # start = nodes[0]
-    # goal = nodes[-1]
+    observer = Observer()
+    solver.observer = observer
     
-    start = choice(list(map.graph.keys()))
-    goal = choice(list(map.graph.keys()))
+    solver.limit(token=CancellationToken())
     
-    Thread(target=solver.search, args=(start, goal)).start()
+    Thread(target=solver.search, args=(start, goal), daemon=True).start()
     
-    map.draw(solver)
+    map.draw(solver, observer, start, goal)
     
\ No newline at end of file
@@ -0,0 +1,165 @@
+from typing import Optional, TYPE_CHECKING
+from heapq import heappush, heappop
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from map import Coord, Map
+    from hierarchy import ContractionHierarchy
+
+Adjacency = list[list[tuple[int, float]]] # Lista de adjacência compacta: vértice -> [(vizinho, custo)]
+
+adjacency: Optional[Adjacency] = None # Grafo compartilhado por cada processo trabalhador
+
+def compact(map: 'Map') -> Adjacency:
+    ''' Retorna o grafo do mapa como lista de adjacência indexada pelos índices dos vértices. '''
+
+    return [
+        [(map.ids[neighbor], map.cost(coord, neighbor)) for neighbor in map.graph[coord]]
+        for coord in map.nodes
+    ]
+
+def dijkstra(graph: Adjacency, source: int, targets: Optional[list[int]] = None) -> np.ndarray:
+    ''' Busca de Dijkstra a partir da origem que termina quando todos os alvos são fixados. '''
+
+    distances = np.full(len(graph), np.inf)
+    distances[source] = 0
+
+    remaining = set(targets) if targets is not None else None
+
+    settled = [False] * len(graph)
+    heap: list[tuple[float, int]] = [(0.0, source)]
+
+    while heap:
+        distance, u = heappop(heap)
+
+        if settled[u]:
+            continue
+
+        settled[u] = True
+
+        if remaining is not None:
+            remaining.discard(u)
+
+            if not remaining:
+                break
+
+        for w, cost in graph[u]:
+            tentative = distance + cost
+
+            if tentative < distances[w]:
+                distances[w] = tentative
+                heappush(heap, (tentative, w))
+
+    return distances
+
+def initialize(graph: Adjacency):
+    ''' Inicializa o processo trabalhador com o grafo compartilhado. '''
+
+    global adjacency
+
+    adjacency = graph
+
+def rows(sources: list[int], targets: list[int]) -> np.ndarray:
+    ''' Calcula as linhas da matriz de distâncias de um bloco de origens (Executado nos trabalhadores). '''
+
+    return np.array([dijkstra(adjacency, source, targets)[targets] for source in sources]).reshape(len(sources), len(targets))
+
+def one_to_all(map: 'Map', source: 'Coord', graph: Optional[Adjacency] = None) -> np.ndarray:
+    ''' Retorna a distância da origem até todos os vértices (graph = compact(map) reaproveitado entre chamadas). '''
+
+    if graph is None:
+        graph = compact(map)
+
+    return dijkstra(graph, map.ids[source])
+
+def one_to_many(map: 'Map', source: 'Coord', targets: list['Coord'], graph: Optional[Adjacency] = None) -> np.ndarray:
+    ''' Retorna a distância da origem até cada alvo com uma única busca (graph = compact(map) reaproveitado). '''
+
+    if graph is None:
+        graph = compact(map)
+
+    ids = [map.ids[target] for target in targets]
+
+    return dijkstra(graph, map.ids[source], ids)[ids]
+
+def many_to_many(
+    map: 'Map',
+    sources: list['Coord'],
+    targets: list['Coord'],
+    processes: Optional[int] = None,
+    graph: Optional[Adjacency] = None
+) -> np.ndarray:
+    ''' Retorna a matriz de distâncias (origens x alvos), dividindo as origens entre processos. '''
+
+    if graph is None:
+        graph = compact(map)
+
+    source_ids = [map.ids[source] for source in sources]
+    target_ids = [map.ids[target] for target in targets]
+
+    processes = min(processes or cpu_count() or 1, len(source_ids))
+
+    if processes <= 1:
+        return np.array([dijkstra(graph, source, target_ids)[target_ids] for source in source_ids]).reshape(len(sources), len(targets))
+
+    chunks = [source_ids[i::processes] for i in range(processes)]
+
+    matrix = np.empty((len(sources), len(targets)))
+
+    with ProcessPoolExecutor(processes, initializer=initialize, initargs=(graph,)) as executor:
+        for i, result in enumerate(executor.map(rows, chunks, [target_ids] * processes)):
+            matrix[i::processes] = result
+
+    return matrix
+
+def hierarchy_many_to_many(
+    hierarchy: 'ContractionHierarchy',
+    sources: list['Coord'],
+    targets: list['Coord']
+) -> np.ndarray:
+    ''' Retorna a matriz de distâncias usando buckets sobre a hierarquia de contração. '''
+
+    def upward(graph: Adjacency, source: int) -> dict[int, float]:
+        ''' Busca de Dijkstra completa no grafo ascendente. '''
+
+        distances = {source: 0.0}
+        heap: list[tuple[float, int]] = [(0.0, source)]
+
+        while heap:
+            distance, u = heappop(heap)
+
+            if distance > distances[u]:
+                continue
+
+            for w, cost in graph[u]:
+                tentative = distance + cost
+
+                if tentative < distances.get(w, float('inf')):
+                    distances[w] = tentative
+                    heappush(heap, (tentative, w))
+
+        return distances
+
+    map = hierarchy.map
+
+    # Cada vértice guarda as distâncias até os alvos cuja busca reversa o alcançou
+    buckets: dict[int, list[tuple[int, float]]] = {}
+
+    for j, target in enumerate(targets):
+        for v, distance in upward(hierarchy.down, map.ids[target]).items():
+            buckets.setdefault(v, []).append((j, distance))
+
+    matrix = np.full((len(sources), len(targets)), np.inf)
+
+    for i, source in enumerate(sources):
+        row = matrix[i]
+
+        for v, distance in upward(hierarchy.up, map.ids[source]).items():
+            for j, remaining in buckets.get(v, ()):
+                if distance + remaining < row[j]:
+                    row[j] = distance + remaining
+
+    return matrix
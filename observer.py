@@ -0,0 +1,63 @@
+from typing import Any
+from queue import Queue, Full, Empty
+
+EXPANDED = 'expanded' # Estado retirado da estrutura e expandido
+GENERATED = 'generated' # Estado vizinho adicionado na estrutura
+PATH = 'path' # Fim da busca (Estado é a solução encontrada, possivelmente vazia)
+
+class Event:
+    ''' Classe que representa um evento publicado por um algoritmo de busca. '''
+
+    __slots__ = ('kind', 'source', 'state')
+
+    def __init__(self, kind: str, source: Any, state: Any):
+        self.kind = kind # Tipo do evento
+        self.source = source # Algoritmo que publicou o evento
+        self.state = state # Estado (ou caminho) associado ao evento
+
+class Observer:
+    ''' Classe que recebe os eventos de uma busca por uma fila limitada. '''
+
+    def __init__(self, maxsize: int = 100000, drop: bool = True):
+        self.events: Queue[Event] = Queue(maxsize)
+
+        self.drop = drop # Descarta eventos com a fila cheia (em vez de bloquear a busca)
+        self.dropped = 0 # Número de eventos descartados
+
+    def publish(self, kind: str, source: Any, state: Any):
+        ''' Publica um evento (O fim da busca nunca é descartado). '''
+
+        event = Event(kind, source, state)
+
+        if not self.drop:
+            self.events.put(event)
+            return
+
+        while True:
+            try:
+                self.events.put_nowait(event)
+                return
+            except Full:
+                self.dropped += 1
+
+                if kind != PATH:
+                    return
+
+            # Abre espaço para o fim da busca descartando o evento mais antigo
+            try:
+                self.events.get_nowait()
+            except Empty:
+                pass
+
+    def drain(self, limit: int) -> list[Event]:
+        ''' Remove e retorna até limit eventos pendentes. '''
+
+        events: list[Event] = []
+
+        while len(events) < limit:
+            try:
+                events.append(self.events.get_nowait())
+            except Empty:
+                break
+
+        return events
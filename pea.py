@@ -0,0 +1,135 @@
+from typing import Optional
+
+from search import Search
+from structure import PriorityQueue
+from observer import EXPANDED, GENERATED
+from state import NPuzzleState
+from idastar import tables
+
+class PartialExpansionAStarSearch(Search):
+    ''' Algoritmo A* de expansão parcial (EPEA*, Manhattan): gera apenas os filhos com f igual ao f armazenado do pai '''
+
+    def __init__(self):
+        super().__init__()
+
+        self.g_score: dict[NPuzzleState, int] = {}
+
+        # Tabelas de seleção de operadores (movimentos e distâncias de cada peça) do último objetivo
+        self.goal: Optional[NPuzzleState] = None
+        self.moves: list[list[tuple[int, int]]] = []
+        self.distances: list[list[int]] = []
+
+    def clear(self):
+        super().clear()
+
+        # (f armazenado, h, g, estado)
+        self.structure: PriorityQueue[tuple[int, int, int, NPuzzleState]] = PriorityQueue()
+
+        self.g_score.clear()
+
+    def prepare(self, goal: NPuzzleState):
+        ''' Pré-calcula as tabelas de seleção de operadores (reutilizadas enquanto o objetivo não mudar). '''
+
+        if self.goal is not None and self.goal == goal:
+            return
+
+        self.goal = goal
+        self.moves, self.distances = tables(goal)
+
+    def search(self, start, goal):
+        self.clear()
+
+        self.prepare(goal)
+
+        cols = start.cols
+        moves = self.moves
+        distances = self.distances
+
+        tiles = [item for row in start.matrix for item in row]
+        h_score = sum(distances[tile][position] for position, tile in enumerate(tiles) if tile != 0)
+
+        self.structure.put((h_score, h_score, 0, start))
+        self.g_score[start] = 0
+
+        while not self.structure.empty():
+            if self.should_stop():
+                break
+
+            self.update_memory()
+
+            stored_f_score, h_score, g_score, self.current = self.structure.get()
+
+            # Entrada antiga (o estado foi alcançado depois por um caminho menor)
+            if g_score > self.g_score[self.current]:
+                continue
+
+            f_score = g_score + h_score
+
+            self.bound = max(self.bound, stored_f_score)
+
+            if self.current == goal:
+                self.update_path()
+
+                break
+
+            self.update_expanded()
+
+            if self.observer is not None:
+                self.observer.publish(EXPANDED, self, self.current)
+
+            blank = self.current.i * cols + self.current.j
+
+            # Variação de f de cada movimento, calculada sem gerar o filho (peça vizinha se aproxima ou se afasta do objetivo)
+            next_f_score = None
+
+            generated = 0
+            duplicates = 0
+
+            for move, target in moves[blank]:
+                i, j = divmod(target, cols)
+
+                tile = self.current.matrix[i][j]
+
+                delta = 1 + distances[tile][blank] - distances[tile][target]
+
+                child_f_score = f_score + delta
+
+                if child_f_score > stored_f_score:
+                    # Filho adiado: o pai volta para a fila com o menor f ainda não gerado
+                    if next_f_score is None or child_f_score < next_f_score:
+                        next_f_score = child_f_score
+
+                    continue
+
+                if child_f_score < stored_f_score:
+                    continue # Gerado em uma expansão anterior do mesmo pai
+
+                tentative_g_score = g_score + 1
+
+                neighbor = self.current.moved(i, j)
+
+                if neighbor in self.g_score and self.g_score[neighbor] <= tentative_g_score:
+                    duplicates += 1
+                    continue
+
+                self.update_branches()
+                generated += 1
+
+                neighbor_h_score = child_f_score - tentative_g_score
+
+                self.structure.put((child_f_score, neighbor_h_score, tentative_g_score, neighbor))
+                self.g_score[neighbor] = tentative_g_score
+
+                if self.observer is not None:
+                    self.observer.publish(GENERATED, self, neighbor)
+
+            if next_f_score is not None:
+                self.structure.put((next_f_score, h_score, g_score, self.current))
+
+            if self.tracer is not None:
+                self.tracer.record(
+                    hash(self.current), g_score, h_score, stored_f_score, self.structure.size(), generated, duplicates
+                )
+
+        self.update_timer()
+        self.update_done()
@@ -0,0 +1,157 @@
+from typing import Callable, Optional
+from json import loads, dumps
+from os.path import exists
+from time import time
+from multiprocessing import Process, Queue
+from queue import Empty
+
+from search import Search, BreadthFirstSearch, IterativeDeepeningSearch, AStarSearch, BidirectionalAStarSearch, SOLVED, EXHAUSTED
+from state import NPuzzleState
+from constructive import ConstructiveSearch
+
+STATS_PATH = 'portfolio.json' # Histórico de vitórias de cada algoritmo
+
+# Algoritmos disponíveis (Construídos dentro de cada processo pelo nome)
+SOLVERS: dict[str, Callable[[], Search]] = {
+    'BFS': lambda: BreadthFirstSearch(),
+    'IDS': lambda: IterativeDeepeningSearch(),
+    'A_STAR_H1': lambda: AStarSearch(NPuzzleState.tiles_out_of_place),
+    'A_STAR_H2': lambda: AStarSearch(NPuzzleState.manhattan_distance),
+    'BIDIRECTIONAL_H1': lambda: BidirectionalAStarSearch(NPuzzleState.tiles_out_of_place),
+    'BIDIRECTIONAL_H2': lambda: BidirectionalAStarSearch(NPuzzleState.manhattan_distance),
+    'CONSTRUCTIVE': lambda: ConstructiveSearch()
+}
+
+# Algoritmos com solução comprovadamente ótima (e que provam a ausência de solução ao esgotar)
+OPTIMAL = ('BFS', 'IDS', 'A_STAR_H1', 'A_STAR_H2')
+
+DEFAULT = ('BFS', 'IDS', 'A_STAR_H1', 'A_STAR_H2', 'BIDIRECTIONAL_H1', 'BIDIRECTIONAL_H2')
+
+def run(name: str, start: list[list[int]], goal: list[list[int]], results: Queue):
+    ''' Executa um algoritmo do portfólio (Executado em um processo separado). '''
+
+    try:
+        solver = SOLVERS[name]()
+        solver.search(NPuzzleState(start), NPuzzleState(goal))
+
+        result = {
+            'status': solver.result.status,
+            'path': [state.matrix for state in solver.path],
+            'timer': solver.timer,
+            'memory': solver.memory,
+            'expanded': solver.expanded,
+            'branches': solver.branches
+        }
+    except Exception as error:
+        result = {'status': 'error', 'error': f'{type(error).__name__}: {error}', 'path': []}
+
+    results.put((name, result))
+
+class Portfolio:
+    ''' Classe que executa vários algoritmos em paralelo sobre a mesma instância, encerrando os perdedores. '''
+
+    def __init__(self, names: tuple[str, ...] = DEFAULT, accept: tuple[str, ...] = OPTIMAL, stats_path: Optional[str] = STATS_PATH):
+        for name in names:
+            if name not in SOLVERS:
+                raise ValueError(f'Algoritmo desconhecido: {name}')
+
+        self.names = names # Algoritmos da corrida
+        self.accept = accept # Algoritmos cuja resposta encerra a corrida (Os demais ficam como reserva)
+
+        self.stats_path = stats_path
+
+        self.stats = self.load()
+
+    def load(self) -> dict:
+        ''' Carrega o histórico de vitórias. '''
+
+        if self.stats_path is None or not exists(self.stats_path):
+            return {'races': 0, 'wins': {}, 'timer': {}}
+
+        with open(self.stats_path, 'r') as file:
+            return loads(file.read())
+
+    def save(self):
+        ''' Salva o histórico de vitórias. '''
+
+        if self.stats_path is None:
+            return
+
+        with open(self.stats_path, 'w') as file:
+            file.write(dumps(self.stats, indent=2))
+
+    def record(self, name: Optional[str], timer: float):
+        ''' Registra o vencedor de uma corrida. '''
+
+        self.stats['races'] += 1
+
+        if name is not None:
+            self.stats['wins'][name] = self.stats['wins'].get(name, 0) + 1
+            self.stats['timer'][name] = self.stats['timer'].get(name, 0) + timer
+
+        self.save()
+
+    def race(self, start: NPuzzleState, goal: NPuzzleState, timeout: Optional[float] = None) -> tuple[Optional[str], Optional[dict]]:
+        ''' Retorna o vencedor e seu resultado (A melhor reserva se nenhum aceito terminar a tempo). '''
+
+        timer = time()
+        deadline = timer + timeout if timeout is not None else float('inf')
+
+        results: Queue = Queue()
+
+        processes = {
+            name: Process(target=run, args=(name, start.matrix, goal.matrix, results), daemon=True)
+            for name in self.names
+        }
+
+        for process in processes.values():
+            process.start()
+
+        winner: Optional[str] = None
+        result: Optional[dict] = None
+
+        pending = len(processes)
+        finished: set[str] = set() # Algoritmos que responderam ou encerraram sem responder
+
+        try:
+            while pending > 0:
+                remaining = deadline - time()
+
+                if remaining <= 0:
+                    break
+
+                try:
+                    name, candidate = results.get(timeout=min(remaining, 1))
+                except Empty:
+                    # Processos encerrados sem resposta (ex.: falta de memória)
+                    for other, process in processes.items():
+                        if other not in finished and not process.is_alive():
+                            finished.add(other)
+                            pending -= 1
+
+                    continue
+
+                if name in finished:
+                    continue # Já descontado como encerrado
+
+                finished.add(name)
+                pending -= 1
+
+                if candidate['status'] == SOLVED and (result is None or len(candidate['path']) < len(result['path'])):
+                    winner, result = name, candidate
+
+                # Resposta aceita (ou prova de que não há solução) encerra a corrida
+                if name in self.accept and candidate['status'] in (SOLVED, EXHAUSTED):
+                    winner, result = name, candidate
+                    break
+        finally:
+            for process in processes.values():
+                if process.is_alive():
+                    process.terminate()
+
+            for process in processes.values():
+                process.join()
+
+        self.record(winner, time() - timer)
+
+        return winner, result
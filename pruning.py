@@ -0,0 +1,163 @@
+from collections import deque
+
+from state import NPuzzleState
+
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3 # Movimentos do espaço vazio (Na ordem de NPuzzleState.expand)
+
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1)) # Deslocamento (linha, coluna) de cada movimento
+
+MAX_LENGTH = 8 # Tamanho máximo das sequências duplicadas procuradas
+
+PRUNED = -1 # Transição proibida (o movimento gera um estado já alcançável por uma sequência menor)
+
+automata: dict[int, 'MoveAutomaton'] = {} # Autômatos já construídos por tamanho máximo
+
+class MoveAutomaton:
+    ''' Classe que representa o autômato de poda de movimentos duplicados (sequências que levam ao mesmo estado). '''
+
+    def __init__(self, forbidden: list[tuple[int, ...]]):
+        self.forbidden = forbidden # Sequências proibidas (nenhuma contém outra)
+
+        # Autômato de Aho-Corasick das sequências proibidas (estado 0 = nenhum movimento)
+        self.transitions: list[list[int]] = [[PRUNED] * 4]
+        terminal = [False]
+
+        for sequence in forbidden:
+            node = 0
+
+            for move in sequence:
+                if self.transitions[node][move] == PRUNED:
+                    self.transitions.append([PRUNED] * 4)
+                    terminal.append(False)
+
+                    self.transitions[node][move] = len(self.transitions) - 1
+
+                node = self.transitions[node][move]
+
+            terminal[node] = True
+
+        # Completa as transições pelos links de falha (em largura)
+        fail = [0] * len(self.transitions)
+        queue: deque[int] = deque()
+
+        for move in range(4):
+            child = self.transitions[0][move]
+
+            if child == PRUNED:
+                self.transitions[0][move] = 0
+            else:
+                queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+
+            terminal[node] = terminal[node] or terminal[fail[node]]
+
+            for move in range(4):
+                child = self.transitions[node][move]
+
+                if child == PRUNED:
+                    self.transitions[node][move] = self.transitions[fail[node]][move]
+                else:
+                    fail[child] = self.transitions[fail[node]][move]
+                    queue.append(child)
+
+        for node in range(len(self.transitions)):
+            for move in range(4):
+                if terminal[self.transitions[node][move]]:
+                    self.transitions[node][move] = PRUNED
+
+    @staticmethod
+    def build(max_length: int = MAX_LENGTH) -> 'MoveAutomaton':
+        ''' Procura (em largura) as sequências de até max_length movimentos equivalentes a uma sequência menor. '''
+
+        forbidden: set[tuple[int, ...]] = set()
+
+        # Efeito de cada sequência já vista (posição do vazio, peças deslocadas) -> caixas percorridas pelo vazio
+        seen: dict[tuple, list[tuple[int, int, int, int]]] = {}
+
+        # (sequência, posição do vazio, peças deslocadas, caixa percorrida) num tabuleiro ilimitado
+        queue: deque[tuple[tuple[int, ...], tuple[int, int], dict, tuple[int, int, int, int]]] = deque()
+        queue.append(((), (0, 0), {}, (0, 0, 0, 0)))
+
+        seen[((0, 0), ())] = [(0, 0, 0, 0)]
+
+        while queue:
+            sequence, blank, tiles, box = queue.popleft()
+
+            if len(sequence) >= max_length:
+                continue
+
+            for move, (di, dj) in enumerate(DIRECTIONS):
+                child = sequence + (move,)
+
+                # Sequências com um trecho proibido no final já são podadas pelo autômato
+                if any(child[start:] in forbidden for start in range(1, len(child))):
+                    continue
+
+                target = (blank[0] + di, blank[1] + dj)
+
+                # A peça em target (identificada pela sua posição original) desliza para o vazio
+                moved = dict(tiles)
+                tile = moved.pop(target, target)
+
+                if tile != blank:
+                    moved[blank] = tile
+
+                child_box = (
+                    min(box[0], target[0]), min(box[1], target[1]),
+                    max(box[2], target[0]), max(box[3], target[1])
+                )
+
+                effect = (target, tuple(sorted(moved.items())))
+
+                boxes = seen.setdefault(effect, [])
+
+                # Uma sequência anterior (menor) é aplicável sempre que esta for (caixa contida)
+                if any(
+                    child_box[0] <= other[0] and child_box[1] <= other[1]
+                    and other[2] <= child_box[2] and other[3] <= child_box[3]
+                    for other in boxes
+                ):
+                    forbidden.add(child)
+                    continue
+
+                boxes.append(child_box)
+
+                queue.append((child, target, moved, child_box))
+
+        return MoveAutomaton(sorted(forbidden, key=lambda sequence: (len(sequence), sequence)))
+
+    @staticmethod
+    def get(max_length: int = MAX_LENGTH) -> 'MoveAutomaton':
+        ''' Retorna o autômato (construído uma única vez por processo). '''
+
+        if max_length not in automata:
+            automata[max_length] = MoveAutomaton.build(max_length)
+
+        return automata[max_length]
+
+    def next(self, node: int, move: int) -> int:
+        ''' Retorna o estado após o movimento (PRUNED se o movimento deve ser podado). '''
+
+        return self.transitions[node][move]
+
+def successors(state: NPuzzleState, automaton: MoveAutomaton, node: int) -> list[tuple[int, NPuzzleState, int]]:
+    ''' Expande o estado apenas pelos movimentos permitidos pelo autômato (Os podados nem são gerados). '''
+
+    states: list[tuple[int, NPuzzleState, int]] = []
+
+    for move, (di, dj) in enumerate(DIRECTIONS):
+        i, j = state.i + di, state.j + dj
+
+        if not (0 <= i < state.rows and 0 <= j < state.cols):
+            continue
+
+        next_node = automaton.next(node, move)
+
+        if next_node == PRUNED:
+            continue
+
+        states.append((1, state.moved(i, j), next_node))
+
+    return states
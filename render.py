@@ -0,0 +1,217 @@
+from typing import Optional
+from os import makedirs, cpu_count
+from os.path import join
+from multiprocessing import Pool
+
+from PIL import Image, ImageDraw, ImageFont
+
+from state import NPuzzleState
+from utils import BOX_SIZE, BG_COLOR, BLOCK_COLOR, BORDER_SIZE, TEXT_SIZE, MOVEMENT_TIME, MOVEMENT_FRAMES, INTERVAL_TIME
+
+TEXT_COLOR = '#000'
+
+FONTS = ('arial.ttf', 'DejaVuSans.ttf') # Fontes tentadas em ordem (com fallback para a padrão do PIL)
+
+Matrix = list[list[int]]
+
+renderers: dict[tuple[int, int, int], 'Renderer'] = {} # Renderizadores reutilizados por cada processo
+
+def font(size: int):
+    ''' Retorna a primeira fonte disponível no sistema. '''
+
+    for name in FONTS:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+
+    return ImageFont.load_default()
+
+class Renderer:
+    ''' Classe que rasteriza estados do n-puzzle em imagens sem janela (PIL). '''
+
+    def __init__(self, rows: int, cols: int, size: int = BOX_SIZE):
+        self.rows = rows
+        self.cols = cols
+
+        self.block_size = size // max(rows, cols) # Tamanho de cada peça
+
+        self.width = self.block_size * cols
+        self.height = self.block_size * rows
+
+        self.background = Image.new('RGB', (self.width, self.height), BG_COLOR)
+
+        text_font = font(TEXT_SIZE)
+
+        # Sprites pré-renderizados de cada peça
+        self.sprites: dict[int, Image.Image] = {}
+
+        for value in range(1, rows * cols):
+            sprite = Image.new('RGB', (self.block_size, self.block_size), BG_COLOR)
+            draw = ImageDraw.Draw(sprite)
+
+            draw.rectangle(
+                (BORDER_SIZE // 2, BORDER_SIZE // 2, self.block_size - BORDER_SIZE // 2 - 1, self.block_size - BORDER_SIZE // 2 - 1),
+                fill=BLOCK_COLOR
+            )
+
+            draw.text(
+                (self.block_size / 2, self.block_size / 2),
+                str(value),
+                fill=TEXT_COLOR,
+                font=text_font,
+                anchor='mm'
+            )
+
+            self.sprites[value] = sprite
+
+        # Paleta única compartilhada pelos sprites (Os quadros em modo P dispensam quantização no GIF)
+        atlas = Image.new('RGB', (self.block_size * len(self.sprites) + self.block_size, self.block_size), BG_COLOR)
+
+        for value, sprite in self.sprites.items():
+            atlas.paste(sprite, (value * self.block_size, 0))
+
+        palette = atlas.quantize(colors=256, dither=Image.Dither.NONE)
+
+        self.background = self.background.quantize(palette=palette, dither=Image.Dither.NONE)
+
+        for value, sprite in self.sprites.items():
+            self.sprites[value] = sprite.quantize(palette=palette, dither=Image.Dither.NONE)
+
+    @staticmethod
+    def get(matrix: Matrix, size: int = BOX_SIZE) -> 'Renderer':
+        ''' Retorna um renderizador (reutilizado) para o formato da matriz. '''
+
+        key = (len(matrix), len(matrix[0]), size)
+
+        if key not in renderers:
+            renderers[key] = Renderer(*key)
+
+        return renderers[key]
+
+    def frame(self, matrix: Matrix, moving: Optional[tuple[int, int, float, float]] = None) -> Image.Image:
+        ''' Rasteriza um estado (moving = linha, coluna e deslocamento de uma peça em movimento). '''
+
+        image = self.background.copy()
+
+        for i, row in enumerate(matrix):
+            for j, value in enumerate(row):
+                if value == 0:
+                    continue
+
+                x = j * self.block_size
+                y = i * self.block_size
+
+                if moving is not None and moving[0] == i and moving[1] == j:
+                    x += round(moving[2] * self.block_size)
+                    y += round(moving[3] * self.block_size)
+
+                image.paste(self.sprites[value], (x, y))
+
+        return image
+
+    def frames(self, steps: list[Matrix], animate: bool = True) -> list[Image.Image]:
+        ''' Rasteriza a solução (com os quadros intermediários de cada movimento se animate). '''
+
+        images: list[Image.Image] = []
+
+        for curr, next in zip(steps, steps[1:]):
+            images.append(self.frame(curr))
+
+            if not animate:
+                continue
+
+            i0, j0 = blank(next)
+            i1, j1 = blank(curr)
+
+            # A peça em (i0, j0) desliza até o espaço vazio em (i1, j1)
+            for counter in range(1, MOVEMENT_FRAMES):
+                t = counter / MOVEMENT_FRAMES
+
+                images.append(self.frame(curr, (i0, j0, (j1 - j0) * t, (i1 - i0) * t)))
+
+        if steps:
+            images.append(self.frame(steps[-1]))
+
+        return images
+
+def blank(matrix: Matrix) -> tuple[int, int]:
+    ''' Retorna a posição do espaço vazio. '''
+
+    for i, row in enumerate(matrix):
+        if 0 in row:
+            return i, row.index(0)
+
+    raise ValueError('Matriz sem espaço vazio.')
+
+def matrices(steps: list[NPuzzleState] | list[Matrix]) -> list[Matrix]:
+    ''' Converte a solução em uma lista de matrizes (Serializável entre processos). '''
+
+    return [step.matrix if isinstance(step, NPuzzleState) else step for step in steps]
+
+def save_gif(steps: list[NPuzzleState] | list[Matrix], filepath: str, animate: bool = True):
+    ''' Salva a animação da solução como GIF. '''
+
+    steps = matrices(steps)
+
+    images = Renderer.get(steps[0]).frames(steps, animate)
+
+    if animate:
+        # Quadros estáticos a cada MOVEMENT_FRAMES, intercalados com os quadros do movimento
+        durations = [
+            INTERVAL_TIME if i % MOVEMENT_FRAMES == 0 else MOVEMENT_TIME // MOVEMENT_FRAMES
+            for i in range(len(images))
+        ]
+    else:
+        durations = [MOVEMENT_TIME + INTERVAL_TIME] * len(images)
+
+    images[0].save(filepath, save_all=True, append_images=images[1:], duration=durations, loop=0, optimize=False)
+
+def save_png(steps: list[NPuzzleState] | list[Matrix], directory: str, animate: bool = False):
+    ''' Salva a sequência de quadros da solução como PNGs numerados. '''
+
+    steps = matrices(steps)
+
+    makedirs(directory, exist_ok=True)
+
+    for i, image in enumerate(Renderer.get(steps[0]).frames(steps, animate)):
+        image.save(join(directory, f'{i:05d}.png'))
+
+def render(job: tuple[list[Matrix], str, str, bool]) -> str:
+    ''' Renderiza uma solução (Executado nos processos trabalhadores). '''
+
+    steps, filepath, format, animate = job
+
+    if format == 'gif':
+        save_gif(steps, filepath, animate)
+    else:
+        save_png(steps, filepath, animate)
+
+    return filepath
+
+def render_many(
+    solutions: list[list[NPuzzleState]] | list[list[Matrix]],
+    directory: str,
+    format: str = 'gif',
+    animate: bool = True,
+    processes: Optional[int] = None
+) -> list[str]:
+    ''' Renderiza várias soluções em paralelo (sem servidor gráfico). '''
+
+    if format not in ('gif', 'png'):
+        raise ValueError('Formato inválido.')
+
+    makedirs(directory, exist_ok=True)
+
+    jobs = [
+        (matrices(steps), join(directory, f'{i:05d}.gif' if format == 'gif' else f'{i:05d}'), format, animate)
+        for i, steps in enumerate(solutions)
+    ]
+
+    processes = min(processes or cpu_count() or 1, len(jobs))
+
+    if processes <= 1:
+        return [render(job) for job in jobs]
+
+    with Pool(processes) as pool:
+        return pool.map(render, jobs, chunksize=max(1, len(jobs) // (processes * 4)))
@@ -1,9 +1,68 @@
 from typing import Callable, Optional
 from time import time
+from json import loads
+from struct import pack, unpack_from
 
 from structure import *
 
-from state import State
+from state import State, NPuzzleState
+from observer import Observer, EXPANDED, GENERATED, PATH
+from tracing import Tracer
+from transposition import TranspositionTable
+from pruning import MoveAutomaton, successors
+from checkpoint import Checkpoint, STATE, PUSH, POP, DEPTH, COMMIT, encode, decode
+
+SOLVED = 'solved' # Solução encontrada
+EXHAUSTED = 'exhausted' # Espaço de busca esgotado sem solução
+NODES = 'nodes' # Limite de nós expandidos atingido
+TIMEOUT = 'timeout' # Prazo atingido
+CANCELLED = 'cancelled' # Busca cancelada
+
+CHECK_INTERVAL = 256 # Iterações entre as verificações de prazo e cancelamento
+
+class CancellationToken:
+    ''' Classe que representa um pedido cooperativo de cancelamento de uma busca. '''
+    
+    def __init__(self):
+        self.cancelled = False
+    
+    def cancel(self):
+        ''' Solicita o cancelamento. '''
+        
+        self.cancelled = True
+    
+    def is_cancelled(self) -> bool:
+        ''' Verifica se o cancelamento foi solicitado. '''
+        
+        return self.cancelled
+
+class Result:
+    ''' Classe que representa o resultado (possivelmente parcial) de uma busca. '''
+    
+    def __init__(
+        self, 
+        status: str, 
+        bound: float, 
+        frontier: int, 
+        memory: int, 
+        expanded: int, 
+        branches: int, 
+        timer: float, 
+        path: list[State]
+    ):
+        self.status = status # Motivo do término da busca
+        self.bound = bound # Melhor limite (f) alcançado até o término
+        self.frontier = frontier # Tamanho da fronteira no término
+        
+        self.memory = memory
+        self.expanded = expanded
+        self.branches = branches
+        self.timer = timer
+        
+        self.path = path # Solução encontrada (vazia se parcial)
+    
+    def __repr__(self):
+        return f'Result({self.status}, bound={self.bound}, frontier={self.frontier}, expanded={self.expanded})'
 
 class Search:
     ''' Classe abstrata que define um algoritmo de busca '''
@@ -23,6 +82,37 @@ class Search:
         
         self.path: list[State] = [] # Solução encontrada pelo algoritmo
         
+        self.observer: Optional[Observer] = None # Observador opcional dos eventos da busca
+        self.tracer: Optional[Tracer] = None # Gravador opcional das expansões da busca
+        self.checkpoint: Optional[Checkpoint] = None # Ponto de restauração opcional (n-puzzle, retomado na próxima busca)
+        self.resumable = False # Se o algoritmo grava e retoma pontos de restauração
+        
+        self.max_nodes: Optional[int] = None # Limite de nós expandidos
+        self.timeout: Optional[float] = None # Prazo (em segundos) da busca
+        self.token: Optional[CancellationToken] = None # Token de cancelamento cooperativo
+        
+        self.deadline = float('inf') # Instante limite da busca
+        self.checks = 0 # Contador de verificações de prazo e cancelamento
+        
+        self.status = EXHAUSTED # Motivo do término da busca
+        self.bound: float = 0 # Melhor limite (f) alcançado pela busca
+        
+        self.result: Optional[Result] = None # Resultado estruturado da última busca
+    
+    def limit(
+        self, 
+        nodes: Optional[int] = None, 
+        timeout: Optional[float] = None, 
+        token: Optional[CancellationToken] = None
+    ):
+        ''' Define os limites de nós, tempo e o token de cancelamento do algoritmo '''
+        
+        self.max_nodes = nodes
+        self.timeout = timeout
+        self.token = token
+        
+        return self
+        
     def clear(self):
         ''' Reinicia as variáveis do algoritmo '''
         
@@ -40,6 +130,89 @@ class Search:
         
         self.path.clear()
         
+        if self.checkpoint is not None and not self.resumable:
+            raise ValueError(f'{type(self).__name__} não suporta pontos de restauração.')
+        
+        self.deadline = self.timer + self.timeout if self.timeout is not None else float('inf')
+        self.checks = 0
+        
+        self.status = EXHAUSTED
+        self.bound = 0
+        
+        self.result = None
+    
+    def should_stop(self, expanded: Optional[int] = None, interval: int = CHECK_INTERVAL) -> bool:
+        ''' Verifica (de forma barata) se algum limite da busca foi atingido '''
+        
+        if self.max_nodes is not None and (self.expanded if expanded is None else expanded) >= self.max_nodes:
+            self.status = NODES
+            return True
+        
+        self.checks += 1
+        
+        # Prazo e cancelamento são verificados apenas a cada interval chamadas
+        if self.checks % interval:
+            return False
+        
+        if time() >= self.deadline:
+            self.status = TIMEOUT
+            return True
+        
+        if self.token is not None and self.token.is_cancelled():
+            self.status = CANCELLED
+            return True
+        
+        return False
+    
+    def open_checkpoint(self, start: State, goal: State) -> list[tuple[int, bytes]]:
+        ''' Abre o ponto de restauração e retorna os registros a retomar (vazio se a busca começa do zero) '''
+        
+        if self.checkpoint is None:
+            return []
+        
+        if not isinstance(start, NPuzzleState) or not isinstance(goal, NPuzzleState):
+            raise ValueError('Pontos de restauração são suportados apenas no n-puzzle.')
+        
+        header = {'solver': type(self).__name__, 'start': start.matrix, 'goal': goal.matrix}
+        
+        records = self.checkpoint.open(header)
+        
+        # Restaura os contadores do último ponto consistente (O tempo continua de onde parou)
+        for kind, payload in reversed(records):
+            if kind != COMMIT:
+                continue
+            
+            counters = loads(payload)
+            
+            self.expanded = counters['expanded']
+            self.branches = counters['branches']
+            self.memory = counters['memory']
+            self.bound = counters['bound']
+            self.timer -= counters['timer']
+            
+            break
+        
+        return records
+    
+    def update_checkpoint(self, force: bool = False):
+        ''' Grava um ponto de restauração quando chega a hora (ou se force) '''
+        
+        if self.checkpoint is None or not (force or self.checkpoint.due()):
+            return
+        
+        self.checkpoint.commit({
+            'expanded': self.expanded,
+            'branches': self.branches,
+            'memory': self.memory,
+            'bound': self.bound,
+            'timer': time() - self.timer
+        })
+    
+    def frontier(self) -> int:
+        ''' Retorna o tamanho atual da fronteira do algoritmo '''
+        
+        return self.structure.size() if self.structure is not None else 0
+        
     def update_timer(self):
         ''' Finaliza o cronômetro do algoritmo '''
         
@@ -77,6 +250,27 @@ class Search:
         
         self.is_done = True
         
+        self.result = Result(
+            self.status, 
+            self.bound, 
+            self.frontier(), 
+            self.memory, 
+            self.expanded, 
+            self.branches, 
+            self.timer, 
+            list(self.path) # Cópia (A próxima busca reaproveita self.path)
+        )
+        
+        if self.observer is not None:
+            self.observer.publish(PATH, self, self.path)
+        
+        # Rastreamento em arquivo: grava os eventos que ainda estão no buffer
+        if self.tracer is not None:
+            self.tracer.flush()
+        
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+        
     def update_path(self, *paths: list[State]):
         ''' Atualiza a solução encontrada pelo algoritmo '''
         
@@ -85,6 +279,8 @@ class Search:
                 self.path.extend(path)
         else:
             self.path.extend(self.current.path())
+        
+        self.status = SOLVED
 
     def search(self, start: State, goal: State):
         ''' Executa o algoritmo de busca '''
@@ -98,24 +294,66 @@ class BreadthFirstSearch(Search):
         super().__init__()
         
         self.closed_set: set[State] = set() # Conjunto de estados visitados
+        
+        self.resumable = True
     
     def clear(self):
         super().clear()
         
-        self.structure: Queue[State] = Queue()
+        self.structure: Queue[tuple[int, State]] = Queue()
         
         self.closed_set.clear()
     
+    def resume(self, start: NPuzzleState, records: list[tuple[int, bytes]]):
+        ''' Reconstrói a fila e os visitados a partir dos estados gravados (na ordem de geração) '''
+        
+        states: list[NPuzzleState] = []
+        depths: list[int] = []
+        
+        for kind, payload in records:
+            if kind != STATE:
+                continue
+            
+            parent = unpack_from('<i', payload)[0]
+            
+            if parent < 0:
+                state = start
+                depths.append(0)
+            else:
+                state = NPuzzleState(decode(payload[4:], start.cols), states[parent])
+                depths.append(depths[parent] + 1)
+            
+            states.append(state)
+            self.closed_set.add(state)
+        
+        # A fila é o final da ordem de geração (Os primeiros expanded estados já foram expandidos)
+        for depth, state in zip(depths[self.expanded:], states[self.expanded:]):
+            self.structure.put((depth, state))
+    
     def search(self, start, goal):
         self.clear()
         
-        self.structure.put(start)
-        self.closed_set.add(start)
+        records = self.open_checkpoint(start, goal)
+        
+        if records:
+            self.resume(start, records)
+        else:
+            self.structure.put((0, start))
+            self.closed_set.add(start)
+            
+            if self.checkpoint is not None:
+                self.checkpoint.record(STATE, pack('<i', -1) + encode(start.matrix))
         
         while not self.structure.empty():
+            if self.should_stop():
+                self.update_checkpoint(True)
+                break
+            
+            self.update_checkpoint()
+            
             self.update_memory()
             
-            self.current = self.structure.get()
+            self.bound, self.current = self.structure.get()
             
             if self.current == goal:
                 self.update_path()
@@ -124,12 +362,33 @@ class BreadthFirstSearch(Search):
 
             self.update_expanded()
             
+            if self.observer is not None:
+                self.observer.publish(EXPANDED, self, self.current)
+            
+            generated = 0
+            duplicates = 0
+            
             for cost, neighbor in self.current.expand():
                 if neighbor not in self.closed_set:
                     self.update_branches()
+                    generated += 1
                     
-                    self.structure.put(neighbor)
+                    self.structure.put((self.bound + 1, neighbor))
                     self.closed_set.add(neighbor)
+                    
+                    if self.checkpoint is not None:
+                        # O estado expandido é o (expanded - 1)-ésimo gerado (fila FIFO)
+                        self.checkpoint.record(STATE, pack('<i', self.expanded - 1) + encode(neighbor.matrix))
+                    
+                    if self.observer is not None:
+                        self.observer.publish(GENERATED, self, neighbor)
+                else:
+                    duplicates += 1
+            
+            if self.tracer is not None:
+                self.tracer.record(
+                    hash(self.current), self.bound, 0, self.bound, self.structure.size(), generated, duplicates
+                )
 
         self.update_timer()
         self.update_done()
@@ -137,17 +396,31 @@ class BreadthFirstSearch(Search):
 class IterativeDeepeningSearch(Search):
     ''' Algoritmo de busca em profundidade iterativa '''
     
-    def __init__(self):
+    def __init__(self, table: Optional[TranspositionTable] = None, fsm: Optional[MoveAutomaton] = None):
         super().__init__()
         
         self.depth = 0 # Profundidade máxima do algoritmo
+        
+        self.resumable = True
+        
+        if table is not None and fsm is not None:
+            # A poda da tabela supõe subárvores completas, que o autômato não expande
+            raise ValueError('Tabela de transposição e autômato de poda não podem ser combinados.')
+        
+        self.table = table # Tabela de transposição opcional (Substitui a verificação de ciclos pelo caminho)
+        self.fsm = fsm # Autômato opcional de poda de movimentos (n-puzzle, substitui a verificação de ciclos pelo caminho)
     
     def clear(self):
         super().clear()
         
-        self.structure: Stack[tuple[int, State]] = Stack()
+        # (Profundidade restante, estado, estado do autômato)
+        self.structure: Stack[tuple[int, State, int]] = Stack()
         
         self.depth = 0
+        
+        # Entradas de uma busca anterior não valem para esta (subárvores não esgotadas, outro objetivo)
+        if self.table is not None:
+            self.table.clear()
     
     def update_depth(self):
         ''' Atualiza a profundidade do algoritmo '''
@@ -157,18 +430,27 @@ class IterativeDeepeningSearch(Search):
     def search(self, start, goal):
         self.clear()
         
+        # Retoma a partir da última iteração esgotada
+        for kind, payload in self.open_checkpoint(start, goal):
+            if kind == DEPTH:
+                self.depth = unpack_from('<i', payload)[0]
+        
         should_break = False
         
         while True:
             print(f'DEPTH: {self.depth}')
             
             self.structure.clear()
-            self.structure.put((self.depth, start))
+            self.structure.put((self.depth, start, 0))
             
             while not self.structure.empty():
+                if self.should_stop():
+                    should_break = True
+                    break
+                
                 self.update_memory()
                 
-                d_score, self.current = self.structure.get()
+                d_score, self.current, node = self.structure.get()
                 
                 if self.current == goal:
                     self.update_path()
@@ -179,82 +461,233 @@ class IterativeDeepeningSearch(Search):
                 if d_score <= 0:
                     continue
 
-                current_path = self.current.path()
+                if self.table is not None:
+                    entry = self.table.lookup(self.current)
+                    
+                    # A subárvore do estado já foi esgotada com profundidade restante maior ou igual
+                    if entry is not None and entry[1] >= d_score:
+                        continue
+                    
+                    self.table.store(self.current, self.depth - d_score, d_score)
+                elif self.fsm is None:
+                    current_path = self.current.path()
 
-                if self.current in current_path[:-1]:
-                    continue
+                    if self.current in current_path[:-1]:
+                        continue
                 
                 self.update_expanded()
                 
-                for cost, neighbor in self.current.expand():
+                if self.observer is not None:
+                    self.observer.publish(EXPANDED, self, self.current)
+                
+                generated = 0
+                
+                if self.fsm is not None:
+                    neighbors = successors(self.current, self.fsm, node)
+                else:
+                    neighbors = [(cost, neighbor, 0) for cost, neighbor in self.current.expand()]
+                
+                for cost, neighbor, next_node in neighbors:
                     self.update_branches()
+                    generated += 1
                     
-                    self.structure.put((d_score - 1, neighbor))
+                    self.structure.put((d_score - 1, neighbor, next_node))
+                    
+                    if self.observer is not None:
+                        self.observer.publish(GENERATED, self, neighbor)
+                
+                if self.tracer is not None:
+                    g_score = self.depth - d_score
+                    
+                    self.tracer.record(
+                        hash(self.current), g_score, 0, g_score, self.structure.size(), generated, 0
+                    )
                     
             if should_break:
                 break
                     
             self.update_depth()
+            
+            # Todas as profundidades menores foram esgotadas
+            self.bound = self.depth
+            
+            if self.checkpoint is not None:
+                self.checkpoint.record(DEPTH, pack('<i', self.depth))
+                self.update_checkpoint(True)
         
         self.update_timer()
         self.update_done()
 
 class AStarSearch(Search):
-    def __init__(self, h: Callable[[State, State], int]):
+    def __init__(self, h: Callable[[State, State], int], table: Optional[TranspositionTable] = None):
         super().__init__()
         
         self.h = h
         
         self.g_score: dict[State, int] = {}
         
+        self.resumable = True
+        
+        self.table = table # Tabela de transposição opcional (Substitui g_score, com memória limitada)
+        
+        self.indices: dict[int, int] = {} # Índice de gravação de cada estado inserido (apenas com ponto de restauração)
+        self.pushes = 0 # Inserções gravadas
+        
     def clear(self):
         super().clear()
         
         self.structure: PriorityQueue[tuple[int, int, State]] = PriorityQueue()
         
         self.g_score.clear()
+        self.indices.clear()
+        
+        self.pushes = 0
+        
+        # Custos de uma busca anterior impediriam a inserção dos vizinhos
+        if self.table is not None:
+            self.table.clear()
 
-    def prepare(self, start: State):
+    def prepare(self, start: State, goal: State):
         ''' Prepara o algoritmo para a execução (Reutilizado no BidirectionalAStarSearch) '''
         
-        self.structure.put((0, 0, start))
-        self.g_score[start] = 0
+        # O início entra com a sua heurística real (f e h corretos no rastreamento)
+        h_score = self.h(start, goal)
+        
+        self.structure.put((h_score, h_score, start))
+        
+        if self.table is not None:
+            self.table.store(start, 0)
+        else:
+            self.g_score[start] = 0
+        
+        if self.checkpoint is not None:
+            self.record(-1, 0, h_score, start)
+
+    def record(self, parent: int, g_score: float, h_score: float, state: State):
+        ''' Grava a inserção de um estado na fila de prioridade '''
+        
+        self.indices[id(state)] = self.pushes
+        self.pushes += 1
+        
+        self.checkpoint.record(PUSH, pack('<idd', parent, g_score, h_score) + encode(state.matrix))
 
-    def step(self, goal: State):
+    def resume(self, start: NPuzzleState, records: list[tuple[int, bytes]]):
+        ''' Refaz as inserções e remoções gravadas (reproduzindo exatamente a fila de prioridade) '''
+        
+        states: list[NPuzzleState] = []
+        
+        for kind, payload in records:
+            if kind == POP:
+                self.structure.get()
+                continue
+            
+            if kind != PUSH:
+                continue
+            
+            parent, g_score, h_score = unpack_from('<idd', payload)
+            
+            if parent < 0:
+                state = start
+            else:
+                state = NPuzzleState(decode(payload[20:], start.cols), states[parent])
+            
+            states.append(state)
+            
+            self.indices[id(state)] = self.pushes
+            self.pushes += 1
+            
+            self.structure.put((g_score + h_score, h_score, state))
+            
+            if self.table is not None:
+                self.table.store(state, g_score)
+            else:
+                self.g_score[state] = g_score
+
+    def step(self, goal: State, f_score: float = 0, h_score: float = 0):
         ''' Executa um passo do algoritmo (Reutilizado no BidirectionalAStarSearch) '''
 
         if self.current is None:
             return
+        
+        # Com a tabela de transposição, o custo do estado vem da própria fila (g = f - h)
+        current_g_score = self.g_score[self.current] if self.table is None else f_score - h_score
 
         self.update_expanded()
+        
+        if self.observer is not None:
+            self.observer.publish(EXPANDED, self, self.current)
+            
+        generated = 0
+        duplicates = 0
             
         for cost, neighbor in self.current.expand():
-            tentative_g_score = self.g_score[self.current] + cost        
+            tentative_g_score = current_g_score + cost        
             
-            if neighbor not in self.g_score or tentative_g_score < self.g_score[neighbor]:
+            if self.table is not None:
+                entry = self.table.lookup(neighbor)
+                
+                is_better = entry is None or tentative_g_score < entry[0]
+            else:
+                is_better = neighbor not in self.g_score or tentative_g_score < self.g_score[neighbor]
+            
+            if is_better:
                 self.update_branches()
+                generated += 1
                 
-                h_score = self.h(neighbor, goal)
+                neighbor_h_score = self.h(neighbor, goal)
             
-                self.structure.put((tentative_g_score + h_score, h_score, neighbor))
-                self.g_score[neighbor] = tentative_g_score
+                self.structure.put((tentative_g_score + neighbor_h_score, neighbor_h_score, neighbor))
+                
+                if self.table is not None:
+                    self.table.store(neighbor, tentative_g_score)
+                else:
+                    self.g_score[neighbor] = tentative_g_score
+                
+                if self.checkpoint is not None:
+                    self.record(self.indices[id(self.current)], tentative_g_score, neighbor_h_score, neighbor)
+                
+                if self.observer is not None:
+                    self.observer.publish(GENERATED, self, neighbor)
+            else:
+                duplicates += 1
+        
+        if self.tracer is not None:
+            self.tracer.record(
+                hash(self.current), current_g_score, h_score, current_g_score + h_score, self.structure.size(), generated, duplicates
+            )
 
     def search(self, start, goal):
         self.clear()
         
-        self.prepare(start)
+        records = self.open_checkpoint(start, goal)
+        
+        if records:
+            self.resume(start, records)
+        else:
+            self.prepare(start, goal)
         
         while not self.structure.empty():
+            if self.should_stop():
+                self.update_checkpoint(True)
+                break
+            
+            self.update_checkpoint()
+            
             self.update_memory()
             
-            _, _, self.current = self.structure.get()
+            f_score, h_score, self.current = self.structure.get()
+            
+            if self.checkpoint is not None:
+                self.checkpoint.record(POP)
+            
+            self.bound = max(self.bound, f_score)
             
             if self.current == goal:
                 self.update_path()
                 
                 break
                 
-            self.step(goal)
+            self.step(goal, f_score, h_score)
              
         self.update_timer()
         self.update_done()
@@ -266,29 +699,52 @@ class BidirectionalAStarSearch(Search):
         self.forward = AStarSearch(h)
         self.backward = AStarSearch(h)
         
+        # A busca reversa grava em outro rastreador (Sua heurística é em direção ao início)
+        self.backward_tracer: Optional[Tracer] = None
+        
+    def frontier(self):
+        return self.forward.frontier() + self.backward.frontier()
+    
     def clear(self):
         super().clear()
         
         self.forward.clear()
         self.backward.clear()
+        
+        # As buscas internas publicam no mesmo observador (identificadas por source)
+        self.forward.observer = self.observer
+        self.backward.observer = self.observer
+        
+        self.forward.tracer = self.tracer
+        self.backward.tracer = self.backward_tracer
     
     def search(self, start: State, goal: State):
         self.clear()
         
-        self.forward.prepare(start)
-        self.backward.prepare(goal)
+        self.forward.prepare(start, goal)
+        self.backward.prepare(goal, start)
         
         while not self.forward.structure.empty() or not self.backward.structure.empty():
+            if self.should_stop(self.forward.expanded + self.backward.expanded):
+                break
+            
             self.update_memory(self.forward.structure, self.backward.structure)
             
             self.forward.current = None
             self.backward.current = None
             
+            forward_f_score = forward_h_score = 0
+            backward_f_score = backward_h_score = 0
+            
             if not self.forward.structure.empty():
-                _, _, self.forward.current = self.forward.structure.get()
+                forward_f_score, forward_h_score, self.forward.current = self.forward.structure.get()
+                self.forward.bound = max(self.forward.bound, forward_f_score)
             
             if not self.backward.structure.empty():
-                _, _, self.backward.current = self.backward.structure.get()
+                backward_f_score, backward_h_score, self.backward.current = self.backward.structure.get()
+                self.backward.bound = max(self.backward.bound, backward_f_score)
+            
+            self.bound = min(self.forward.bound, self.backward.bound)
                 
             if (
                 self.forward.current == self.backward.current 
@@ -318,11 +774,14 @@ class BidirectionalAStarSearch(Search):
                 
                 break
 
-            self.forward.step(goal)
-            self.backward.step(start)
+            self.forward.step(goal, forward_f_score, forward_h_score)
+            self.backward.step(start, backward_f_score, backward_h_score)
         
         self.update_expanded(self.forward.expanded, self.backward.expanded)
         self.update_branches(self.forward.branches, self.backward.branches)
         
+        if self.backward_tracer is not None:
+            self.backward_tracer.flush()
+        
         self.update_timer()
         self.update_done()
\ No newline at end of file
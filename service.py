@@ -0,0 +1,517 @@
+from typing import Any, Callable, Optional
+from json import loads, dumps
+from time import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from argparse import ArgumentParser
+
+import asyncio
+
+from search import Search, BreadthFirstSearch, AStarSearch, SOLVED, EXHAUSTED
+from state import NPuzzleState
+from constructive import ConstructiveSearch, solvable
+from tables import DistanceTable
+
+BATCH_SIZE = 32 # Tamanho máximo de um lote enviado aos trabalhadores
+BATCH_DELAY = 0.002 # Tempo máximo (segundos) de espera para completar um lote
+
+DEADLINE = 30.0 # Prazo padrão (segundos) de cada requisição
+
+LATENCIES = 10000 # Quantidade de latências guardadas para as métricas
+
+TABLE_PATH = 'puzzle8.npz' # Tabela exata do 8-puzzle pré-carregada pelos trabalhadores
+
+# Estado global de cada processo trabalhador (carregado uma única vez)
+table: Optional[DistanceTable] = None
+map: Any = None
+index: Any = None
+landmarks: Any = None
+
+def warm(map_path: Optional[str]):
+    ''' Inicializa o processo trabalhador com as tabelas de heurística e o mapa. '''
+
+    global table, map, index, landmarks
+
+    table = DistanceTable.get(NPuzzleState.goal(8), TABLE_PATH)
+
+    if map_path is not None:
+        from map import Map
+        from spatial import SpatialIndex
+        from alt import Landmarks
+        from cache import HeuristicCache
+
+        map = Map(map_path)
+        index = SpatialIndex(map)
+        landmarks = HeuristicCache(Landmarks.get(map)) # Reaproveitada entre consultas do trabalhador
+
+def prepare(map_path: Optional[str]):
+    ''' Constrói (e salva) as tabelas antes de iniciar os trabalhadores. '''
+
+    warm(map_path)
+
+def partial(solver: Search) -> dict:
+    ''' Retorna o resultado (possivelmente parcial) de um algoritmo. '''
+
+    result = solver.result
+
+    return {
+        'status': result.status,
+        'bound': result.bound,
+        'frontier': result.frontier,
+        'expanded': result.expanded
+    }
+
+def puzzle(query: dict, deadline: float) -> dict:
+    ''' Resolve uma consulta de n-puzzle. '''
+
+    matrix = query['matrix']
+
+    if (
+        not matrix
+        or any(len(row) != len(matrix[0]) for row in matrix)
+        or sorted(item for row in matrix for item in row) != list(range(len(matrix) * len(matrix[0])))
+    ):
+        raise ValueError('Matriz inválida.')
+
+    start = NPuzzleState(matrix)
+
+    if 'goal' in query:
+        goal_matrix = query['goal']
+
+        if (
+            len(goal_matrix) != start.rows
+            or any(len(row) != start.cols for row in goal_matrix)
+            or sorted(item for row in goal_matrix for item in row) != list(range(start.rows * start.cols))
+        ):
+            raise ValueError('Objetivo inválido.')
+
+        goal = NPuzzleState(goal_matrix)
+    else:
+        goal = NPuzzleState.goal(start.rows * start.cols - 1, start.rows)
+
+    algorithm = query.get('algorithm', 'AUTO')
+
+    # Sem solução: responde na hora em vez de ocupar um trabalhador até o prazo
+    if not solvable(start, goal):
+        return {'algorithm': algorithm, 'path': [], 'status': EXHAUSTED, 'bound': 0, 'frontier': 0, 'expanded': 0}
+
+    if algorithm == 'AUTO':
+        if table is not None and goal == table.goal:
+            algorithm = 'TABLE'
+        elif start.rows * start.cols <= 16:
+            algorithm = 'A_STAR_H2'
+        else:
+            algorithm = 'CONSTRUCTIVE'
+
+    if algorithm == 'TABLE':
+        if table is None or goal != table.goal:
+            raise ValueError('Tabela indisponível para esse objetivo.')
+
+        path = table.solve(start)
+
+        return {
+            'algorithm': algorithm,
+            'path': [state.matrix for state in path],
+            'status': SOLVED if path else EXHAUSTED,
+            'bound': max(len(path) - 1, 0),
+            'frontier': 0,
+            'expanded': len(path)
+        }
+
+    solvers: dict[str, Callable[[], Search]] = {
+        'BFS': lambda: BreadthFirstSearch(),
+        'A_STAR_H1': lambda: AStarSearch(NPuzzleState.tiles_out_of_place),
+        'A_STAR_H2': lambda: AStarSearch(NPuzzleState.manhattan_distance),
+        'CONSTRUCTIVE': lambda: ConstructiveSearch()
+    }
+
+    if algorithm not in solvers:
+        raise ValueError(f'Algoritmo desconhecido: {algorithm}.')
+
+    solver = solvers[algorithm]().limit(timeout=deadline)
+    solver.search(start, goal)
+
+    return {
+        'algorithm': algorithm,
+        'path': [state.matrix for state in solver.path],
+        **partial(solver)
+    }
+
+def route(query: dict, deadline: float) -> dict:
+    ''' Resolve uma consulta de rota entre dois pontos (longitude, latitude) do mapa. '''
+
+    if map is None:
+        raise ValueError('Serviço iniciado sem mapa.')
+
+    start, goal = index.snap([tuple(query['start']), tuple(query['goal'])])
+
+    solver = AStarSearch(landmarks).limit(timeout=deadline)
+    solver.search(start, goal)
+
+    return {
+        'path': [(coord.x, coord.y) for coord in solver.path],
+        'distance': sum(map.cost(a, b) for a, b in zip(solver.path, solver.path[1:])),
+        **partial(solver)
+    }
+
+def solve_batch(jobs: list[tuple[str, dict, float]]) -> list[dict]:
+    ''' Resolve um lote de consultas (Executado nos processos trabalhadores). '''
+
+    results: list[dict] = []
+
+    for kind, query, deadline in jobs:
+        timer = time()
+
+        # O prazo é absoluto: consultas que esperaram no lote têm menos tempo
+        remaining = max(deadline - timer, 0)
+
+        try:
+            result = puzzle(query, remaining) if kind == 'puzzle' else route(query, remaining)
+        except Exception as error:
+            # Uma consulta inválida não derruba as demais do lote
+            result = {'error': f'{type(error).__name__}: {error}'}
+
+        result['timer'] = time() - timer
+        results.append(result)
+
+    return results
+
+class Metrics:
+    ''' Classe que acumula as métricas de vazão e latência do serviço. '''
+
+    def __init__(self):
+        self.started = time()
+
+        self.requests = 0 # Requisições recebidas
+        self.completed = 0 # Requisições respondidas com sucesso
+        self.deduplicated = 0 # Requisições atendidas por uma consulta idêntica em andamento
+        self.timeouts = 0 # Requisições que estouraram o prazo
+        self.errors = 0 # Requisições com erro
+
+        self.batches = 0 # Lotes enviados aos trabalhadores
+        self.batched = 0 # Consultas enviadas em lotes
+
+        self.latencies: deque[float] = deque(maxlen=LATENCIES)
+
+    def percentile(self, value: float):
+        ''' Retorna o percentil das latências recentes. '''
+
+        if not self.latencies:
+            return 0.0
+
+        latencies = sorted(self.latencies)
+
+        return latencies[min(len(latencies) - 1, int(value / 100 * len(latencies)))]
+
+    def report(self) -> dict:
+        ''' Retorna as métricas como dicionário. '''
+
+        uptime = time() - self.started
+
+        return {
+            'uptime': uptime,
+            'requests': self.requests,
+            'completed': self.completed,
+            'deduplicated': self.deduplicated,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'batches': self.batches,
+            'batch_size': self.batched / self.batches if self.batches else 0,
+            'throughput': self.completed / uptime if uptime > 0 else 0,
+            'latency_p50': self.percentile(50),
+            'latency_p95': self.percentile(95),
+            'latency_p99': self.percentile(99)
+        }
+
+class Service:
+    ''' Classe que representa o serviço local assíncrono de resolução. '''
+
+    def __init__(self, map_path: Optional[str] = None, workers: Optional[int] = None):
+        self.map_path = map_path
+        self.workers = workers or cpu_count() or 1
+
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+
+        self.metrics = Metrics()
+
+        self.inflight: dict[str, tuple[asyncio.Future, float]] = {} # Consultas idênticas em andamento (e seus prazos)
+        self.pending: list[tuple[tuple[str, dict, float], asyncio.Future]] = [] # Consultas aguardando o lote
+
+        self.flusher: Optional[asyncio.TimerHandle] = None
+        self.tasks: set[asyncio.Task] = set()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080, unix: Optional[str] = None):
+        ''' Prepara as tabelas, inicia os trabalhadores e o servidor (HTTP ou socket Unix). '''
+
+        loop = asyncio.get_running_loop()
+
+        await loop.run_in_executor(None, prepare, self.map_path)
+
+        self.executor = ProcessPoolExecutor(self.workers, initializer=warm, initargs=(self.map_path,))
+
+        if unix is not None:
+            self.server = await asyncio.start_unix_server(self.handle, unix)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port)
+
+    async def stop(self):
+        ''' Encerra o servidor e os trabalhadores. '''
+
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    def submit(self, kind: str, query: dict, deadline: float) -> asyncio.Future:
+        ''' Agenda uma consulta (com prazo absoluto), reutilizando consultas idênticas em andamento. '''
+
+        key = dumps([kind, query], sort_keys=True)
+
+        if key in self.inflight:
+            future, shared_deadline = self.inflight[key]
+
+            if deadline <= shared_deadline:
+                self.metrics.deduplicated += 1
+                return future
+
+            # Consulta ainda no lote: estende o prazo da consulta compartilhada até o maior prazo
+            for index, (_, pending_future) in enumerate(self.pending):
+                if pending_future is future:
+                    self.pending[index] = ((kind, query, deadline), future)
+                    self.inflight[key] = (future, deadline)
+
+                    self.metrics.deduplicated += 1
+                    return future
+
+            # Já enviada com um prazo menor: é agendada de novo com o prazo maior
+
+        loop = asyncio.get_running_loop()
+
+        future = loop.create_future()
+        future.add_done_callback(lambda _: self.release(key, future))
+
+        self.inflight[key] = (future, deadline)
+        self.pending.append(((kind, query, deadline), future))
+
+        if len(self.pending) >= BATCH_SIZE:
+            self.flush()
+        elif self.flusher is None:
+            self.flusher = loop.call_later(BATCH_DELAY, self.flush)
+
+        return future
+
+    def release(self, key: str, future: asyncio.Future):
+        ''' Remove a consulta concluída das consultas em andamento (se não foi substituída por outra). '''
+
+        if key in self.inflight and self.inflight[key][0] is future:
+            del self.inflight[key]
+
+    def flush(self):
+        ''' Envia as consultas pendentes como um lote aos trabalhadores. '''
+
+        if self.flusher is not None:
+            self.flusher.cancel()
+            self.flusher = None
+
+        if not self.pending:
+            return
+
+        batch, self.pending = self.pending, []
+
+        self.metrics.batches += 1
+        self.metrics.batched += len(batch)
+
+        task = asyncio.ensure_future(self.run(batch))
+
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def run(self, batch: list[tuple[tuple[str, dict, float], asyncio.Future]]):
+        ''' Executa um lote nos trabalhadores e resolve as consultas. '''
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            results = await loop.run_in_executor(self.executor, solve_batch, [job for job, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def query(self, kind: str, query: dict) -> tuple[int, dict]:
+        ''' Resolve uma consulta respeitando o seu prazo. '''
+
+        deadline = float(query.pop('deadline', DEADLINE))
+
+        try:
+            future = self.submit(kind, query, time() + deadline)
+
+            result = await asyncio.wait_for(asyncio.shield(future), deadline)
+        except asyncio.TimeoutError:
+            self.metrics.timeouts += 1
+            return 504, {'error': 'Prazo excedido.'}
+        except Exception as error:
+            self.metrics.errors += 1
+            return 500, {'error': f'{type(error).__name__}: {error}'}
+
+        if 'error' in result:
+            self.metrics.errors += 1
+            return 400, result
+
+        if result['status'] not in (SOLVED, EXHAUSTED):
+            self.metrics.timeouts += 1
+            return 504, result
+
+        self.metrics.completed += 1
+
+        return 200, result
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        ''' Atende uma conexão HTTP (uma requisição por conexão). '''
+
+        timer = time()
+
+        request_line: list[str] = []
+
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+
+            headers: dict[str, str] = {}
+
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+
+                if not line:
+                    break
+
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+            if len(request_line) < 2:
+                status, response = 400, {'error': 'Requisição inválida.'}
+            else:
+                status, response = await self.dispatch(request_line[0], request_line[1], body)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as error:
+            status, response = 400, {'error': str(error)}
+
+        if len(request_line) >= 2 and request_line[1] in ('/puzzle', '/route'):
+            self.metrics.latencies.append(time() - timer)
+
+        payload = dumps(response).encode()
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error', 504: 'Gateway Timeout'}
+
+        writer.write(
+            f'HTTP/1.1 {status} {reasons.get(status, "Error")}\r\n'
+            f'Content-Type: application/json\r\n'
+            f'Content-Length: {len(payload)}\r\n'
+            f'Connection: close\r\n\r\n'.encode() + payload
+        )
+
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        ''' Encaminha a requisição para a rota correspondente. '''
+
+        if method == 'GET' and path == '/metrics':
+            return 200, self.metrics.report()
+
+        if method == 'POST' and path in ('/puzzle', '/route'):
+            self.metrics.requests += 1
+
+            query = loads(body or b'{}')
+
+            if not isinstance(query, dict):
+                self.metrics.errors += 1
+                return 400, {'error': 'Consulta inválida.'}
+
+            return await self.query(path[1:], query)
+
+        return 404, {'error': 'Rota inexistente.'}
+
+async def request(
+    method: str,
+    path: str,
+    body: Optional[dict] = None,
+    host: str = '127.0.0.1',
+    port: int = 8080,
+    unix: Optional[str] = None
+) -> tuple[int, dict]:
+    ''' Cliente local do serviço (retorna o status e a resposta). '''
+
+    if unix is not None:
+        reader, writer = await asyncio.open_unix_connection(unix)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    payload = dumps(body).encode() if body is not None else b''
+
+    writer.write(
+        f'{method} {path} HTTP/1.1\r\n'
+        f'Host: {host}\r\n'
+        f'Content-Type: application/json\r\n'
+        f'Content-Length: {len(payload)}\r\n'
+        f'Connection: close\r\n\r\n'.encode() + payload
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+
+    length = 0
+
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+
+        if not line:
+            break
+
+        name, _, value = line.partition(':')
+
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+
+    response = loads(await reader.readexactly(length))
+
+    writer.close()
+    await writer.wait_closed()
+
+    return status, response
+
+async def main():
+    parser = ArgumentParser(description='Serviço local de resolução de n-puzzle e rotas.')
+
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--unix', default=None, help='Caminho do socket Unix (em vez de TCP)')
+    parser.add_argument('--map', default=None, help='Arquivo GeoJSON do mapa')
+    parser.add_argument('--workers', type=int, default=None)
+
+    args = parser.parse_args()
+
+    service = Service(args.map, args.workers)
+
+    await service.start(args.host, args.port, args.unix)
+
+    print(f'Serviço iniciado em {args.unix or f"http://{args.host}:{args.port}"}')
+
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.stop()
+
+if __name__ == '__main__':
+    asyncio.run(main())
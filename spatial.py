@@ -0,0 +1,253 @@
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from map import Coord, Map
+
+LEAF_SIZE = 8 # Quantidade máxima de vértices em uma folha da árvore
+
+class KDNode:
+    ''' Classe que representa um nó da árvore k-d. '''
+
+    def __init__(
+        self,
+        coords: list['Coord'],
+        axis: int = 0,
+        left: Optional['KDNode'] = None,
+        right: Optional['KDNode'] = None
+    ):
+        self.coords = coords # Vértices do nó (Apenas nas folhas)
+        self.axis = axis # Eixo de divisão (0 = x, 1 = y)
+
+        self.left = left # Subárvore com valores menores que o divisor
+        self.right = right # Subárvore com valores maiores que o divisor
+
+        self.split = 0.0 # Valor divisor do nó
+
+        # Caixa delimitadora dos vértices do nó
+        self.min_x = min(coord.x for coord in coords)
+        self.min_y = min(coord.y for coord in coords)
+        self.max_x = max(coord.x for coord in coords)
+        self.max_y = max(coord.y for coord in coords)
+
+    def is_leaf(self):
+        ''' Verifica se o nó é uma folha. '''
+
+        return self.left is None and self.right is None
+
+    def box_distance(self, x: float, y: float):
+        ''' Retorna a menor distância possível entre o ponto e a caixa do nó. '''
+
+        dx = max(self.min_x - x, 0, x - self.max_x)
+        dy = max(self.min_y - y, 0, y - self.max_y)
+
+        return (dx ** 2 + dy ** 2) ** 0.5
+
+class EdgeNode:
+    ''' Classe que representa um nó da árvore k-d das arestas (divididas pelo ponto médio). '''
+
+    def __init__(
+        self,
+        edges: list[tuple['Coord', 'Coord']],
+        axis: int = 0,
+        left: Optional['EdgeNode'] = None,
+        right: Optional['EdgeNode'] = None
+    ):
+        self.edges = edges # Arestas do nó (Apenas nas folhas)
+        self.axis = axis # Eixo de divisão (0 = x, 1 = y)
+
+        self.left = left # Subárvore com pontos médios menores que o divisor
+        self.right = right # Subárvore com pontos médios maiores que o divisor
+
+        # Caixa delimitadora dos segmentos do nó (Não apenas dos pontos médios)
+        self.min_x = min(min(coord.x, neighbor.x) for coord, neighbor in edges)
+        self.min_y = min(min(coord.y, neighbor.y) for coord, neighbor in edges)
+        self.max_x = max(max(coord.x, neighbor.x) for coord, neighbor in edges)
+        self.max_y = max(max(coord.y, neighbor.y) for coord, neighbor in edges)
+
+    def is_leaf(self):
+        ''' Verifica se o nó é uma folha. '''
+
+        return self.left is None and self.right is None
+
+    def box_distance(self, x: float, y: float):
+        ''' Retorna a menor distância possível entre o ponto e os segmentos do nó. '''
+
+        dx = max(self.min_x - x, 0, x - self.max_x)
+        dy = max(self.min_y - y, 0, y - self.max_y)
+
+        return (dx ** 2 + dy ** 2) ** 0.5
+
+def project(x: float, y: float, coord: 'Coord', neighbor: 'Coord') -> tuple[float, float, float]:
+    ''' Retorna a projeção (px, py) do ponto sobre o segmento e a distância até ela. '''
+
+    dx = neighbor.x - coord.x
+    dy = neighbor.y - coord.y
+
+    length = dx ** 2 + dy ** 2
+
+    t = 0.0 if length == 0 else ((x - coord.x) * dx + (y - coord.y) * dy) / length
+    t = min(max(t, 0.0), 1.0)
+
+    px = coord.x + t * dx
+    py = coord.y + t * dy
+
+    return px, py, ((px - x) ** 2 + (py - y) ** 2) ** 0.5
+
+class SpatialIndex:
+    ''' Classe que representa um índice espacial (árvore k-d) dos vértices e arestas de um mapa. '''
+
+    def __init__(self, map: 'Map'):
+        self.map = map
+
+        self.root = self.build(list(map.graph.keys()))
+
+        # Árvore própria das arestas (Uma aresta longa não amplia a busca pelas demais)
+        self.edge_root = self.build_edges(
+            [(coord, neighbor) for coord in map.graph for neighbor in map.graph[coord]]
+        )
+
+    def build(self, coords: list['Coord'], depth: int = 0) -> Optional[KDNode]:
+        ''' Constrói recursivamente a árvore k-d. '''
+
+        if not coords:
+            return None
+
+        axis = depth % 2
+        node = KDNode(coords, axis)
+
+        if len(coords) <= LEAF_SIZE:
+            return node
+
+        coords.sort(key=lambda coord: coord.y if axis else coord.x)
+        middle = len(coords) // 2
+
+        node.split = coords[middle].y if axis else coords[middle].x
+        node.left = self.build(coords[:middle], depth + 1)
+        node.right = self.build(coords[middle:], depth + 1)
+        node.coords = []
+
+        return node
+
+    def build_edges(self, edges: list[tuple['Coord', 'Coord']], depth: int = 0) -> Optional[EdgeNode]:
+        ''' Constrói recursivamente a árvore k-d das arestas (pelo ponto médio de cada uma). '''
+
+        if not edges:
+            return None
+
+        axis = depth % 2
+        node = EdgeNode(edges, axis)
+
+        if len(edges) <= LEAF_SIZE:
+            return node
+
+        if axis:
+            edges.sort(key=lambda edge: edge[0].y + edge[1].y)
+        else:
+            edges.sort(key=lambda edge: edge[0].x + edge[1].x)
+
+        middle = len(edges) // 2
+
+        node.left = self.build_edges(edges[:middle], depth + 1)
+        node.right = self.build_edges(edges[middle:], depth + 1)
+        node.edges = []
+
+        return node
+
+    def nearest_node(self, x: float, y: float) -> Optional['Coord']:
+        ''' Retorna o vértice do mapa mais próximo do ponto. '''
+
+        best: Optional['Coord'] = None
+        best_distance = float('inf')
+
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            node = stack.pop()
+
+            if node.box_distance(x, y) >= best_distance:
+                continue
+
+            if node.is_leaf():
+                for coord in node.coords:
+                    distance = ((coord.x - x) ** 2 + (coord.y - y) ** 2) ** 0.5
+
+                    if distance < best_distance:
+                        best, best_distance = coord, distance
+
+                continue
+
+            # Visita primeiro o lado do divisor que contém o ponto
+            value = y if node.axis else x
+
+            if value < node.split:
+                stack.extend(child for child in (node.right, node.left) if child is not None)
+            else:
+                stack.extend(child for child in (node.left, node.right) if child is not None)
+
+        return best
+
+    def within(self, x: float, y: float, radius: float) -> list['Coord']:
+        ''' Retorna os vértices do mapa dentro do raio do ponto. '''
+
+        coords: list['Coord'] = []
+
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            node = stack.pop()
+
+            if node.box_distance(x, y) > radius:
+                continue
+
+            if node.is_leaf():
+                for coord in node.coords:
+                    if ((coord.x - x) ** 2 + (coord.y - y) ** 2) ** 0.5 <= radius:
+                        coords.append(coord)
+
+                continue
+
+            stack.extend(child for child in (node.left, node.right) if child is not None)
+
+        return coords
+
+    def nearest_edge(self, x: float, y: float) -> Optional[tuple['Coord', 'Coord', 'Coord']]:
+        ''' Retorna a aresta mais próxima do ponto e a projeção do ponto sobre ela. '''
+
+        best: Optional[tuple['Coord', 'Coord', 'Coord']] = None
+        best_distance = float('inf')
+
+        stack = [self.edge_root] if self.edge_root is not None else []
+
+        while stack:
+            node = stack.pop()
+
+            if node.box_distance(x, y) >= best_distance:
+                continue
+
+            if node.is_leaf():
+                for coord, neighbor in node.edges:
+                    px, py, distance = project(x, y, coord, neighbor)
+
+                    if distance < best_distance:
+                        best_distance = distance
+                        best = (coord, neighbor, type(coord)(px, py, self.map))
+
+                continue
+
+            # Visita primeiro o filho cuja caixa está mais perto do ponto (As caixas dos filhos se sobrepõem)
+            children = [child for child in (node.left, node.right) if child is not None]
+            children.sort(key=lambda child: child.box_distance(x, y), reverse=True)
+
+            stack.extend(children)
+
+        return best
+
+    def snap(self, points: list[tuple[float, float]]) -> list[Optional['Coord']]:
+        ''' Retorna o vértice mais próximo de cada um dos pontos. '''
+
+        return [self.nearest_node(x, y) for x, y in points]
+
+    def snap_edges(self, points: list[tuple[float, float]]) -> list[Optional[tuple['Coord', 'Coord', 'Coord']]]:
+        ''' Retorna a aresta mais próxima de cada um dos pontos. '''
+
+        return [self.nearest_edge(x, y) for x, y in points]
@@ -1,6 +1,8 @@
 from typing import Optional
 from random import choice
 
+from zobrist import hash_matrix, move
+
 class State:
     ''' Classe abstrata que representa um estado de um problema de busca. '''
     
@@ -34,12 +36,15 @@ class State:
 class NPuzzleState(State):
     ''' Classe que representa um estado de um problema do quebra-cabeça n-puzzle.'''
     
-    def __init__(self, matrix: list[list[int]], parent: Optional['NPuzzleState'] = None):
+    def __init__(self, matrix: list[list[int]], parent: Optional['NPuzzleState'] = None, key: Optional[int] = None):
         self.matrix = matrix # Matriz do estado
         self.parent = parent # Estado pai
         
         self.grid = len(matrix) # Tamanho da matriz
         
+        self.rows = len(matrix) # Quantidade de linhas
+        self.cols = len(matrix[0]) # Quantidade de colunas
+        
         for i, row in enumerate(matrix):
             if 0 not in row:
                 continue
@@ -48,6 +53,9 @@ class NPuzzleState(State):
             self.j = row.index(0) # Posição da coluna do espaço vazio
             
             break
+        
+        # Chave de Zobrist (Atualizada em O(1) a cada movimento)
+        self.key = hash_matrix(matrix) if key is None else key
 
     def __str__(self):
         ''' Retorna a representação do estado em string. '''
@@ -64,7 +72,7 @@ class NPuzzleState(State):
     def __hash__(self):
         ''' Retorna o hash do estado. (Quando usado como chave em um dicionário). '''
         
-        return hash(tuple(item for row in self.matrix for item in row))
+        return self.key
 
     def __eq__(self, other: Optional['NPuzzleState']):
         ''' Método de comparação da igualdade de estados. '''
@@ -72,7 +80,18 @@ class NPuzzleState(State):
         if other is None:
             return False
         
-        return self.matrix == other.matrix
+        return self.key == other.key and self.matrix == other.matrix
+    
+    def moved(self, i: int, j: int):
+        ''' Retorna o estado com a peça em (i, j) movida para o espaço vazio. '''
+        
+        matrix = [row[:] for row in self.matrix]
+        
+        tile = matrix[i][j]
+        
+        matrix[self.i][self.j], matrix[i][j] = tile, 0
+        
+        return NPuzzleState(matrix, self, move(self.key, self.rows, self.cols, tile, (i, j), (self.i, self.j)))
     
     def __ne__(self, other: Optional['NPuzzleState']):
         ''' Método de comparação da diferença de estados. '''
@@ -87,25 +106,17 @@ class NPuzzleState(State):
     def up(self):
         ''' Move o espaço vazio para cima. '''
         
-        matrix = [row[:] for row in self.matrix]
-        
-        matrix[self.i][self.j], matrix[self.i - 1][self.j] = matrix[self.i - 1][self.j], matrix[self.i][self.j]
-        
-        return NPuzzleState(matrix, self)
+        return self.moved(self.i - 1, self.j)
 
     def is_down_possible(self):
         ''' Verifica se é possível mover o espaço vazio para baixo. '''
         
-        return self.i != self.grid - 1
+        return self.i != self.rows - 1
     
     def down(self):
         ''' Move o espaço vazio para baixo. '''
         
-        matrix = [row[:] for row in self.matrix]
-        
-        matrix[self.i][self.j], matrix[self.i + 1][self.j] = matrix[self.i + 1][self.j], matrix[self.i][self.j]
-        
-        return NPuzzleState(matrix, self)
+        return self.moved(self.i + 1, self.j)
 
     def is_left_possible(self):
         ''' Verifica se é possível mover o espaço vazio para a esquerda.'''
@@ -115,25 +126,17 @@ class NPuzzleState(State):
     def left(self):
         ''' Move o espaço vazio para a esquerda. '''
         
-        matrix = [row[:] for row in self.matrix]
-        
-        matrix[self.i][self.j], matrix[self.i][self.j - 1] = matrix[self.i][self.j - 1], matrix[self.i][self.j]
-        
-        return NPuzzleState(matrix, self)
+        return self.moved(self.i, self.j - 1)
     
     def is_right_possible(self):
         ''' Verifica se é possível mover o espaço vazio para a direita. '''
         
-        return self.j != self.grid - 1
+        return self.j != self.cols - 1
     
     def right(self):
         ''' Move o espaço vazio para a direita. '''
         
-        matrix = [row[:] for row in self.matrix]
-        
-        matrix[self.i][self.j], matrix[self.i][self.j + 1] = matrix[self.i][self.j + 1], matrix[self.i][self.j]
-        
-        return NPuzzleState(matrix, self)
+        return self.moved(self.i, self.j + 1)
 
     def expand(self):
         states: list[tuple[int, NPuzzleState]] = []
@@ -153,28 +156,34 @@ class NPuzzleState(State):
         return states
     
     @staticmethod
-    def goal(n: int):
-        ''' Retorna o estado objetivo de um n-puzzle. '''
+    def goal(n: int, rows: Optional[int] = None):
+        ''' Retorna o estado objetivo de um n-puzzle (quadrado, ou com rows linhas se informado). '''
         
-        grid = (n + 1) ** 0.5
-        
-        if grid != int(grid):
-            raise ValueError('Valor de N inválido.')
-        
-        grid = int(grid)
+        if rows is None:
+            grid = (n + 1) ** 0.5
+            
+            if grid != int(grid):
+                raise ValueError('Valor de N inválido.')
+            
+            rows = cols = int(grid)
+        else:
+            if rows <= 0 or (n + 1) % rows != 0:
+                raise ValueError('Valor de N inválido.')
+            
+            cols = (n + 1) // rows
         
         # Cria a matriz do estado objetivo
-        matrix = [[1 + j + i * grid for j in range(grid)] for i in range(grid)]
+        matrix = [[1 + j + i * cols for j in range(cols)] for i in range(rows)]
         # Criando o espaço vazio
-        matrix[grid - 1][grid - 1] = 0
+        matrix[rows - 1][cols - 1] = 0
         
         return NPuzzleState(matrix)
 
     @staticmethod
-    def start(n: int, steps: int = 100):
+    def start(n: int, steps: int = 100, rows: Optional[int] = None):
         ''' Retorna um estado inicial aleatório de um n-puzzle. '''
         
-        state = NPuzzleState.goal(n)
+        state = NPuzzleState.goal(n, rows)
         
         for i in range(steps):
             states: list[NPuzzleState] = []
@@ -200,21 +209,15 @@ class NPuzzleState(State):
         
         distance = 0
         
-        for i1 in range(self.grid):
-            for j1 in range(self.grid):
+        # Posição de cada peça no objetivo
+        positions = {item: (i, j) for i, row in enumerate(goal.matrix) for j, item in enumerate(row)}
+        
+        for i1 in range(self.rows):
+            for j1 in range(self.cols):
                 if self.matrix[i1][j1] == 0:
                     continue
                 
-                for i2 in range(goal.grid):
-                    should_break = False
-                    
-                    for j2 in range(goal.grid):
-                        if self.matrix[i1][j1] == goal.matrix[i2][j2]:
-                            should_break = True
-                            break
-                
-                    if should_break:
-                        break
+                i2, j2 = positions[self.matrix[i1][j1]]
                 
                 distance += abs(i1 - i2) + abs(j1 - j2)
         
@@ -225,8 +228,8 @@ class NPuzzleState(State):
         
         counter = 0
         
-        for i in range(self.grid):
-            for j in range(self.grid):
+        for i in range(self.rows):
+            for j in range(self.cols):
                 if self.matrix[i][j] == 0:
                     continue
                 
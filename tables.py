@@ -0,0 +1,309 @@
+from typing import Callable, Optional
+from math import factorial
+from os.path import exists
+
+import numpy as np
+
+from search import Search
+from state import NPuzzleState
+from checkpoint import Checkpoint, LEVEL
+
+MAX_CELLS = 12 # Maior tabuleiro suportado (12! estados cabem em int64)
+
+UNREACHED = 255 # Distância dos estados não alcançados
+
+class Permutations:
+    ''' Classe que representa o ranqueamento (lexicográfico) vetorizado de permutações. '''
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+
+        self.cells = rows * cols
+
+        if self.cells > MAX_CELLS:
+            raise ValueError('Tabuleiro grande demais para a tabela de distâncias.')
+
+        self.size = factorial(self.cells) # Quantidade de permutações
+
+        self.factorials = np.array([factorial(self.cells - 1 - i) for i in range(self.cells)], dtype=np.int64)
+
+        # Posição vizinha do espaço vazio em cada direção (cima, baixo, esquerda, direita), -1 se impossível
+        self.moves = np.full((self.cells, 4), -1, dtype=np.int64)
+
+        for position in range(self.cells):
+            i, j = divmod(position, cols)
+
+            if i > 0: self.moves[position, 0] = position - cols
+            if i < rows - 1: self.moves[position, 1] = position + cols
+            if j > 0: self.moves[position, 2] = position - 1
+            if j < cols - 1: self.moves[position, 3] = position + 1
+
+    def rank(self, tiles: np.ndarray) -> np.ndarray:
+        ''' Retorna o rank de cada linha de permutações (m x cells). '''
+
+        ranks = np.zeros(len(tiles), dtype=np.int64)
+
+        for i in range(self.cells - 1):
+            smaller = (tiles[:, i + 1:] < tiles[:, i:i + 1]).sum(axis=1)
+            ranks += smaller * self.factorials[i]
+
+        return ranks
+
+    def unrank(self, ranks: np.ndarray) -> np.ndarray:
+        ''' Retorna a permutação (m x cells) de cada rank. '''
+
+        tiles = np.empty((len(ranks), self.cells), dtype=np.int8)
+        available = np.ones((len(ranks), self.cells), dtype=bool)
+
+        remainder = ranks.copy()
+        rows = np.arange(len(ranks))
+
+        for i in range(self.cells):
+            digit, remainder = np.divmod(remainder, self.factorials[i])
+
+            # O digit-ésimo valor ainda disponível
+            value = np.argmax(np.cumsum(available, axis=1) > digit[:, None], axis=1)
+
+            tiles[:, i] = value
+            available[rows, value] = False
+
+        return tiles
+
+    def flatten(self, state: NPuzzleState) -> np.ndarray:
+        ''' Retorna o estado como uma linha de permutação. '''
+
+        return np.array([[item for row in state.matrix for item in row]], dtype=np.int8)
+
+def breadth_first_levels(
+    permutations: Permutations,
+    source: int,
+    stop: Optional[int] = None,
+    interrupt: Optional[Callable[[int], bool]] = None,
+    checkpoint: Optional[Checkpoint] = None
+) -> tuple[np.ndarray, list[int]]:
+    ''' BFS síncrona por níveis a partir do rank de origem (para ao alcançar o rank stop ou se interrupt). '''
+
+    distances = np.full(permutations.size, UNREACHED, dtype=np.uint8)
+    visited = np.zeros((permutations.size + 7) // 8, dtype=np.uint8) # Conjunto de visitados (bitset)
+
+    distances[source] = 0
+    visited[source >> 3] |= np.uint8(1 << (source & 7))
+
+    frontier = np.array([source], dtype=np.int64)
+    sizes = [1] # Tamanho de cada nível
+
+    level = 0
+    rows = None
+
+    if checkpoint is not None:
+        header = {'solver': 'levels', 'rows': permutations.rows, 'cols': permutations.cols, 'source': source}
+
+        # Retoma refazendo os níveis gravados (Cada nível é gravado uma única vez, ao ser concluído)
+        for kind, payload in checkpoint.open(header):
+            if kind != LEVEL:
+                continue
+
+            frontier = np.frombuffer(payload, dtype=np.int64)
+
+            level += 1
+
+            distances[frontier] = level
+            np.bitwise_or.at(visited, frontier >> 3, (1 << (frontier & 7)).astype(np.uint8))
+
+            if len(frontier):
+                sizes.append(len(frontier))
+
+    while len(frontier) and (stop is None or distances[stop] == UNREACHED):
+        if interrupt is not None and interrupt(sum(sizes[:-1])):
+            break
+
+        tiles = permutations.unrank(frontier)
+        blanks = np.argmax(tiles == 0, axis=1)
+
+        if rows is None or len(rows) < len(frontier):
+            rows = np.arange(len(frontier))
+
+        children: list[np.ndarray] = []
+
+        for direction in range(4):
+            targets = permutations.moves[blanks, direction]
+            valid = targets >= 0
+
+            if not valid.any():
+                continue
+
+            moved = tiles[valid].copy()
+            index = rows[:len(moved)]
+
+            # Troca o espaço vazio com a peça vizinha
+            moved[index, blanks[valid]] = moved[index, targets[valid]]
+            moved[index, targets[valid]] = 0
+
+            children.append(permutations.rank(moved))
+
+        if not children:
+            break
+
+        ranks = np.unique(np.concatenate(children))
+
+        seen = (visited[ranks >> 3] >> (ranks & 7).astype(np.uint8)) & 1
+        frontier = ranks[seen == 0]
+
+        level += 1
+
+        distances[frontier] = level
+        np.bitwise_or.at(visited, frontier >> 3, (1 << (frontier & 7)).astype(np.uint8))
+
+        if len(frontier):
+            sizes.append(len(frontier))
+
+        if checkpoint is not None:
+            checkpoint.record(LEVEL, frontier.tobytes())
+            checkpoint.commit({'level': level})
+
+    if checkpoint is not None:
+        checkpoint.close()
+
+    return distances, sizes
+
+class DistanceTable:
+    ''' Classe que representa a tabela exata de distâncias até o objetivo (tabuleiros pequenos). '''
+
+    def __init__(self, goal: NPuzzleState, distances: np.ndarray):
+        self.goal = goal
+        self.distances = distances # Distância de cada rank até o objetivo (UNREACHED se insolúvel)
+
+        self.permutations = Permutations(len(goal.matrix), len(goal.matrix[0]))
+
+    @staticmethod
+    def build(goal: NPuzzleState, checkpoint: Optional[Checkpoint] = None) -> 'DistanceTable':
+        ''' Constrói a tabela completa com uma BFS síncrona por níveis a partir do objetivo. '''
+
+        permutations = Permutations(len(goal.matrix), len(goal.matrix[0]))
+
+        source = int(permutations.rank(permutations.flatten(goal))[0])
+
+        distances, _ = breadth_first_levels(permutations, source, checkpoint=checkpoint)
+
+        return DistanceTable(goal, distances)
+
+    def save(self, filepath: str):
+        ''' Salva a tabela (junto do objetivo) em um arquivo .npz. '''
+
+        with open(filepath, 'wb') as file:
+            np.savez_compressed(file, goal=np.array(self.goal.matrix), distances=self.distances)
+
+    @staticmethod
+    def load(filepath: str) -> Optional['DistanceTable']:
+        ''' Carrega uma tabela salva (None se ausente). '''
+
+        if not exists(filepath):
+            return None
+
+        data = np.load(filepath)
+
+        return DistanceTable(NPuzzleState(data['goal'].tolist()), data['distances'])
+
+    @staticmethod
+    def get(goal: NPuzzleState, filepath: str) -> 'DistanceTable':
+        ''' Carrega a tabela ou a constrói (e salva) se necessário. '''
+
+        table = DistanceTable.load(filepath)
+
+        if table is None or table.goal != goal:
+            table = DistanceTable.build(goal)
+            table.save(filepath)
+
+        return table
+
+    def lookup(self, state: NPuzzleState) -> Optional[int]:
+        ''' Retorna a distância exata do estado até o objetivo (None se insolúvel). '''
+
+        distance = int(self.distances[self.permutations.rank(self.permutations.flatten(state))[0]])
+
+        return None if distance == UNREACHED else distance
+
+    def __call__(self, state: NPuzzleState, goal: NPuzzleState) -> int:
+        ''' Heurística perfeita (Usa Manhattan se o objetivo não for o da tabela). '''
+
+        if goal != self.goal:
+            return state.manhattan_distance(goal)
+
+        distance = self.lookup(state)
+
+        return 0 if distance is None else distance
+
+    def solve(self, start: NPuzzleState) -> list[NPuzzleState]:
+        ''' Retorna uma solução ótima descendo pela tabela (vazia se insolúvel). '''
+
+        distance = self.lookup(start)
+
+        if distance is None:
+            return []
+
+        current = NPuzzleState(start.matrix)
+
+        while distance > 0:
+            for cost, neighbor in current.expand():
+                if self.lookup(neighbor) == distance - 1:
+                    current = neighbor
+                    distance -= 1
+                    break
+
+        return current.path()
+
+class LevelBreadthFirstSearch(Search):
+    ''' Algoritmo de busca em largura síncrona por níveis (vetorizada, para tabuleiros pequenos) '''
+
+    def __init__(self):
+        super().__init__()
+
+        self.depth = 0 # Profundidade da solução
+        self.level = 0 # Tamanho do último nível gerado
+
+        self.resumable = True
+
+    def clear(self):
+        super().clear()
+
+        self.depth = 0
+        self.level = 0
+
+    def frontier(self):
+        return self.level
+
+    def search(self, start, goal):
+        self.clear()
+
+        permutations = Permutations(len(goal.matrix), len(goal.matrix[0]))
+
+        source = int(permutations.rank(permutations.flatten(goal))[0])
+        target = int(permutations.rank(permutations.flatten(start))[0])
+
+        # Busca a partir do objetivo (Os movimentos são reversíveis), verificando os limites a cada nível
+        distances, sizes = breadth_first_levels(
+            permutations,
+            source,
+            target,
+            lambda expanded: self.should_stop(expanded, interval=1),
+            self.checkpoint
+        )
+
+        self.memory = max(sizes)
+        self.expanded = sum(sizes[:-1])
+        self.branches = sum(sizes[1:])
+
+        self.bound = len(sizes) - 1
+        self.level = sizes[-1]
+
+        if distances[target] != UNREACHED:
+            table = DistanceTable(goal, distances)
+
+            self.current = table.solve(start)[-1]
+            self.update_path()
+
+            self.depth = len(self.path) - 1
+
+        self.update_timer()
+        self.update_done()
@@ -0,0 +1,170 @@
+from typing import Optional
+from sys import argv
+
+import numpy as np
+
+from state import State
+
+# Formato compacto de um evento de expansão
+EVENT = np.dtype([
+    ('key', np.int64), # Hash do estado expandido
+    ('g', np.float32), # Custo do início até o estado
+    ('h', np.float32), # Heurística do estado
+    ('f', np.float32), # g + h
+    ('open', np.uint32), # Tamanho da fronteira na expansão
+    ('generated', np.uint16), # Vizinhos adicionados na fronteira
+    ('duplicates', np.uint16) # Vizinhos descartados (já vistos com custo menor ou igual)
+])
+
+CAPACITY = 1 << 20 # Capacidade padrão do buffer circular (eventos)
+
+class Tracer:
+    ''' Classe que grava os eventos de expansão de uma busca em um buffer circular pré-alocado. '''
+
+    def __init__(self, capacity: int = CAPACITY, filepath: Optional[str] = None):
+        self.events = np.zeros(capacity, EVENT)
+        self.capacity = capacity
+
+        self.count = 0 # Eventos gravados desde o início (inclusive os sobrescritos ou descarregados)
+        self.flushed = 0 # Eventos já descarregados no arquivo
+
+        self.filepath = filepath # Arquivo binário opcional (O buffer é descarregado ao encher)
+
+        if filepath is not None:
+            open(filepath, 'wb').close()
+
+    def record(self, key: int, g: float, h: float, f: float, open: int, generated: int, duplicates: int):
+        ''' Grava um evento de expansão. '''
+
+        if self.filepath is not None and self.count - self.flushed == self.capacity:
+            self.flush()
+
+        self.events[self.count % self.capacity] = (key, g, h, f, open, generated, duplicates)
+        self.count += 1
+
+    def flush(self):
+        ''' Descarrega no arquivo os eventos ainda não gravados. '''
+
+        if self.filepath is None or self.count == self.flushed:
+            return
+
+        with open(self.filepath, 'ab') as file:
+            self.ordered(self.flushed).tofile(file)
+
+        self.flushed = self.count
+
+    def ordered(self, start: int = 0) -> np.ndarray:
+        ''' Retorna (em ordem) os eventos do buffer a partir do evento start. '''
+
+        start = max(start, self.count - self.capacity)
+
+        indices = np.arange(start, self.count) % self.capacity
+
+        return self.events[indices]
+
+    def snapshot(self) -> np.ndarray:
+        ''' Retorna todos os eventos disponíveis (do arquivo e do buffer) em ordem. '''
+
+        if self.filepath is None:
+            return self.ordered()
+
+        self.flush()
+
+        return load(self.filepath)
+
+def load(filepath: str) -> np.ndarray:
+    ''' Carrega os eventos de um arquivo binário de rastreamento. '''
+
+    return np.fromfile(filepath, dtype=EVENT)
+
+def exact(path: list[State], costs: Optional[list[float]] = None) -> dict[int, float]:
+    ''' Retorna h* dos estados de uma solução ótima (custo unitário se costs não for informado). '''
+
+    if costs is None:
+        costs = [1.0] * (len(path) - 1)
+
+    h_star: dict[int, float] = {}
+    remaining = 0.0
+
+    h_star[hash(path[-1])] = remaining
+
+    for state, cost in zip(reversed(path[:-1]), reversed(costs)):
+        remaining += cost
+        h_star[hash(state)] = remaining
+
+    return h_star
+
+def f_histogram(events: np.ndarray) -> dict[float, int]:
+    ''' Retorna a quantidade de expansões em cada nível de f. '''
+
+    values, counts = np.unique(events['f'], return_counts=True)
+
+    return dict(zip(values.tolist(), counts.tolist()))
+
+def branching(events: np.ndarray) -> dict[float, float]:
+    ''' Retorna o fator de ramificação efetivo (vizinhos adicionados por expansão) em cada profundidade. '''
+
+    depths, inverse = np.unique(events['g'], return_inverse=True)
+
+    generated = np.bincount(inverse, weights=events['generated'])
+    expanded = np.bincount(inverse)
+
+    return dict(zip(depths.tolist(), (generated / expanded).tolist()))
+
+def duplicates(events: np.ndarray) -> float:
+    ''' Retorna a taxa de vizinhos gerados que eram duplicados. '''
+
+    total = events['generated'].sum(dtype=np.int64) + events['duplicates'].sum(dtype=np.int64)
+
+    return float(events['duplicates'].sum(dtype=np.int64) / total) if total else 0.0
+
+def heuristic_error(events: np.ndarray, h_star: dict[int, float]) -> dict[str, float]:
+    ''' Compara h com h* nos estados expandidos cujo custo exato é conhecido. '''
+
+    known = np.array([key in h_star for key in events['key'].tolist()], dtype=bool)
+
+    if not known.any():
+        return {'states': 0, 'mean_error': 0.0, 'max_error': 0.0, 'mean_ratio': 0.0}
+
+    h = events['h'][known].astype(np.float64)
+    real = np.array([h_star[key] for key in events['key'][known].tolist()])
+
+    error = real - h
+    ratio = np.divide(h, real, out=np.ones_like(h), where=real > 0)
+
+    return {
+        'states': int(known.sum()),
+        'mean_error': float(error.mean()),
+        'max_error': float(error.max()),
+        'mean_ratio': float(ratio.mean())
+    }
+
+def report(events: np.ndarray, h_star: Optional[dict[int, float]] = None) -> str:
+    ''' Retorna um relatório textual de um rastreamento. '''
+
+    lines = [f'Expansões: {len(events)}', f'Taxa de duplicados: {duplicates(events):.3f}', '', 'Histograma de f:']
+
+    histogram = f_histogram(events)
+    largest = max(histogram.values(), default=1)
+
+    for f, count in histogram.items():
+        lines.append(f'{f:>10g} {count:>10} ' + '#' * max(1, 50 * count // largest))
+
+    lines.extend(['', 'Ramificação por profundidade:'])
+
+    for g, value in branching(events).items():
+        lines.append(f'{g:>10g} {value:>10.3f}')
+
+    if h_star is not None:
+        lines.extend(['', 'Erro da heurística (h* - h):'])
+
+        for name, value in heuristic_error(events, h_star).items():
+            lines.append(f'{name:>12} {value:>10.3f}')
+
+    return '\n'.join(lines)
+
+if __name__ == '__main__':
+    if len(argv) < 2:
+        print('Uso: python tracing.py <arquivo de rastreamento>')
+    else:
+        print(report(load(argv[1])))
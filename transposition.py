@@ -0,0 +1,126 @@
+from typing import Optional
+from multiprocessing import shared_memory
+from struct import pack, unpack
+
+import numpy as np
+
+ALWAYS = 'always' # Substitui sempre a entrada do slot
+DEPTH = 'depth' # Mantém a entrada de maior profundidade (Subárvore mais cara de refazer)
+
+POLICIES = (ALWAYS, DEPTH)
+
+MASK = (1 << 64) - 1
+
+USED = 1 << 63 # Bit que marca o slot como ocupado
+
+class TranspositionTable:
+    ''' Classe que representa uma tabela de transposição de tamanho fixo (vetores numpy, compartilháveis entre processos). '''
+
+    def __init__(self, size: int = 1 << 20, policy: str = DEPTH, shared: bool = False, name: Optional[str] = None):
+        if policy not in POLICIES:
+            raise ValueError('Política de substituição inválida.')
+
+        self.size = 1 << max(0, size - 1).bit_length() # Quantidade de slots (potência de 2)
+        self.mask = self.size - 1
+
+        self.policy = policy
+
+        self.memory: Optional[shared_memory.SharedMemory] = None # Memória compartilhada (se shared ou name)
+
+        nbytes = self.size * 3 * 8
+
+        if name is not None:
+            self.memory = shared_memory.SharedMemory(name)
+        elif shared:
+            self.memory = shared_memory.SharedMemory(create=True, size=nbytes)
+
+        # Cada slot guarda (chave ^ dados ^ valor, dados, valor) com o valor em float64 (custos reais do mapa)
+        # (Entradas rasgadas por escritas concorrentes são descartadas)
+        if self.memory is not None:
+            self.entries = np.ndarray((self.size, 3), dtype=np.uint64, buffer=self.memory.buf)
+            
+            if name is None:
+                self.entries.fill(0)
+        else:
+            self.entries = np.zeros((self.size, 3), dtype=np.uint64)
+
+        self.hits = 0 # Consultas encontradas
+        self.misses = 0 # Consultas não encontradas
+        self.stores = 0 # Entradas gravadas
+
+    @property
+    def name(self) -> Optional[str]:
+        ''' Nome da memória compartilhada (Para TranspositionTable.attach nos outros processos). '''
+
+        return None if self.memory is None else self.memory.name
+
+    @staticmethod
+    def attach(name: str, size: int, policy: str = DEPTH) -> 'TranspositionTable':
+        ''' Conecta-se à tabela compartilhada criada por outro processo. '''
+
+        return TranspositionTable(size, policy, name=name)
+
+    def close(self, unlink: bool = False):
+        ''' Libera a memória compartilhada (unlink apenas no processo que a criou). '''
+
+        if self.memory is None:
+            return
+
+        del self.entries
+
+        self.memory.close()
+
+        if unlink:
+            self.memory.unlink()
+
+        self.memory = None
+
+    def clear(self):
+        ''' Remove todas as entradas (Chamado no início de cada busca: uma tabela atende uma busca de cada vez). '''
+
+        self.entries.fill(0)
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def lookup(self, state) -> Optional[tuple[float, int]]:
+        ''' Retorna o valor e a profundidade guardados para o estado (None se ausente). '''
+
+        key = hash(state) & MASK
+
+        check, data, value = self.entries[key & self.mask]
+        check, data, value = int(check), int(data), int(value)
+
+        if data == 0 or check ^ data ^ value != key:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        return unpack('<d', pack('<Q', value))[0], (data ^ USED) >> 32
+
+    def store(self, state, value: float, depth: int = 0):
+        ''' Guarda o valor do estado (g ou profundidade restante) conforme a política de substituição. '''
+
+        key = hash(state) & MASK
+        slot = key & self.mask
+
+        if self.policy == DEPTH:
+            check, data, bits = self.entries[slot]
+            check, data, bits = int(check), int(data), int(bits)
+
+            # Entradas de outros estados só são substituídas por outras tão profundas quanto elas
+            if data != 0 and check ^ data ^ bits != key and (data ^ USED) >> 32 > depth:
+                return
+
+        data = (depth << 32) | USED
+        bits = unpack('<Q', pack('<d', value))[0]
+
+        self.entries[slot] = (key ^ data ^ bits, data, bits)
+        self.stores += 1
+
+    def usage(self) -> float:
+        ''' Retorna a fração de slots ocupados. '''
+
+        return float(np.count_nonzero(self.entries[:, 1])) / self.size
@@ -28,7 +28,10 @@ def draw(steps: list[NPuzzleState]):
     root = Tk()
     root.title("N Puzzle")
 
-    canvas = Canvas(root, width=BOX_SIZE, height=BOX_SIZE, background=BG_COLOR)
+    width = BOX_SIZE * steps[0].cols // max(steps[0].rows, steps[0].cols)
+    height = BOX_SIZE * steps[0].rows // max(steps[0].rows, steps[0].cols)
+
+    canvas = Canvas(root, width=width, height=height, background=BG_COLOR)
     canvas.pack()
 
     rectangles: list[int | None] = []
@@ -39,16 +42,16 @@ def draw(steps: list[NPuzzleState]):
 
     start = steps[0]
 
-    for i in range(start.grid):
+    block_size = BOX_SIZE / max(start.rows, start.cols)
+
+    for i in range(start.rows):
         rectangles_row = []
         texts_row = []
         
         rectangles_row_pos = []
         texts_row_pos = []
         
-        for j in range(start.grid):
-            block_size = BOX_SIZE / start.grid
-            
+        for j in range(start.cols):
             x = j * block_size
             y = i * block_size
             
@@ -0,0 +1,43 @@
+from random import Random
+
+SEED = 0x5EED # Semente fixa (As chaves são as mesmas em todos os processos)
+
+BITS = 61 # Chaves menores que 2^61 - 1 (hash(chave) == chave em Python)
+
+tables: dict[tuple[int, int], list[list[int]]] = {} # Tabelas de chaves por formato do tabuleiro
+
+def keys(rows: int, cols: int) -> list[list[int]]:
+    ''' Retorna a tabela de chaves aleatórias (posição x peça) do formato do tabuleiro. '''
+
+    shape = (rows, cols)
+
+    if shape not in tables:
+        random = Random(SEED ^ (rows << 16) ^ cols)
+
+        cells = rows * cols
+
+        # O espaço vazio não tem chave (Sua posição é determinada pelas peças)
+        tables[shape] = [[0] + [random.getrandbits(BITS) for _ in range(1, cells)] for _ in range(cells)]
+
+    return tables[shape]
+
+def hash_matrix(matrix: list[list[int]]) -> int:
+    ''' Retorna a chave de Zobrist de uma matriz (Calculada do zero). '''
+
+    cols = len(matrix[0])
+    table = keys(len(matrix), cols)
+
+    key = 0
+
+    for i, row in enumerate(matrix):
+        for j, item in enumerate(row):
+            key ^= table[i * cols + j][item]
+
+    return key
+
+def move(key: int, rows: int, cols: int, tile: int, source: tuple[int, int], target: tuple[int, int]) -> int:
+    ''' Atualiza a chave em O(1) ao mover a peça de source para target. '''
+
+    table = keys(rows, cols)
+
+    return key ^ table[source[0] * cols + source[1]][tile] ^ table[target[0] * cols + target[1]][tile]